@@ -0,0 +1,61 @@
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple, Union
+
+
+class MemoryCache:
+    """In-process stand-in for the subset of the Redis API used by the app.
+
+    Used when no Redis server is configured; entries live in this process only.
+    Bounded both by entry count and by the total size of the stored values,
+    since a single cached GitHub page can be hundreds of kilobytes.
+    """
+
+    def __init__(self, maxsize: int = 4096, max_bytes: int = 64 * 1024 * 1024):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a value, or None if missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Union[str, bytes], ex: Optional[int] = None) -> None:
+        """Set a value, expiring after `ex` seconds if given"""
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+
+        self._discard(key)
+        if len(value) > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+
+        expires_at = time.monotonic() + ex if ex else None
+        self._entries[key] = (value, expires_at)
+        self.size += len(value)
+
+        # Evict least recently used entries
+        while len(self._entries) > self.maxsize or self.size > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    async def delete(self, key: str) -> None:
+        """Delete a value"""
+        self._discard(key)
+
+    def _discard(self, key: str) -> None:
+        """Drop an entry if present, keeping the size total in step"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[0])
@@ -1,5 +1,6 @@
-from pydantic_settings import BaseSettings
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Optional
 
 
 class Settings(BaseSettings):
@@ -12,12 +13,16 @@ class Settings(BaseSettings):
     app_url: str = "http://localhost:8000"
     debug: bool = True
     
+    # Redis (sessions are kept in signed cookies when unset)
+    redis_url: Optional[str] = None
+    
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = 1
+    max_inflight_requests: int = 64
     
-    class Config:
-        env_file = ".env"
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
 
 @lru_cache()
@@ -1,26 +1,101 @@
 from fastapi import FastAPI, Request, Depends, HTTPException, Form
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from starlette.middleware.sessions import SessionMiddleware
 from authlib.integrations.starlette_client import OAuth
+from contextlib import asynccontextmanager
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from logging.handlers import QueueHandler, QueueListener
+from redis.asyncio import Redis
 import httpx
 import asyncio
+import logging
+import orjson
+import queue
 import sys
-from typing import List, Optional
+from typing import List, Any
 
+from app.cache import MemoryCache
 from app.config import get_settings, Settings
 from app.models import (
     CreateContextRequest, UpdateContextRequest, CreateContextFileRequest, 
     UpdateContextFileRequest, Context, ContextFile
 )
-from app.services import GitHubService, context_service
+from app.services import GitHubError, GitHubService, context_service, fetch_all_pages, fetch_page
+from app.sessions import RedisSessionMiddleware
 
-app = FastAPI(title="Context Marketplace")
+logger = logging.getLogger(__name__)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def configure_logging(level: int) -> QueueListener:
+    """Route log records through a queue so handlers never block the event loop"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.handlers = [QueueHandler(log_queue)]
+
+    listener = QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared resources on startup and release them on shutdown"""
+    log_listener = configure_logging(logging.DEBUG if settings.debug else logging.INFO)
+    # One pooled HTTP/2 client for every GitHub API call
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        headers={'Accept': 'application/vnd.github+json'},
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=30
+    )
+    app.state.redis = redis_client
+    # Shared key/value cache (Redis when configured, in-process otherwise)
+    app.state.cache = redis_client or MemoryCache()
+    # Write context changes back to the database in the background
+    flusher = asyncio.create_task(context_service.run_flusher())
+    yield
+    flusher.cancel()
+    await asyncio.gather(flusher, return_exceptions=True)
+    await app.state.http.aclose()
+    if redis_client:
+        await redis_client.aclose()
+    log_listener.stop()
+
+
+app = FastAPI(title="Context Marketplace", lifespan=lifespan, default_response_class=ORJSONResponse)
 settings = get_settings()
 
 # Session middleware for OAuth
-app.add_middleware(SessionMiddleware, secret_key=settings.secret_key)
+redis_client = Redis.from_url(settings.redis_url) if settings.redis_url else None
+if redis_client:
+    app.add_middleware(RedisSessionMiddleware, redis=redis_client, secret_key=settings.secret_key)
+else:
+    app.add_middleware(SessionMiddleware, secret_key=settings.secret_key)
+
+# Caps requests handled at once by a single process
+INFLIGHT = asyncio.Semaphore(settings.max_inflight_requests)
+
+
+@app.middleware("http")
+async def shed_load(request: Request, call_next):
+    """Reject requests with 503 instead of queueing them when the process is saturated"""
+    if INFLIGHT.locked():
+        return Response(status_code=503, headers={"Retry-After": "1"})
+    async with INFLIGHT:
+        return await call_next(request)
+
 
 # OAuth setup
 oauth = OAuth()
@@ -36,7 +111,20 @@ oauth.register(
 
 # Static files and templates
 app.mount("/static", StaticFiles(directory="static"), name="static")
-templates = Jinja2Templates(directory="templates")
+templates = Environment(
+    loader=FileSystemLoader("templates"),
+    autoescape=True,
+    enable_async=True,
+    # Only check templates for changes while developing
+    auto_reload=settings.debug,
+    bytecode_cache=FileSystemBytecodeCache()
+)
+
+
+async def render_template(name: str, context: dict) -> HTMLResponse:
+    """Render a template without blocking the event loop"""
+    template = templates.get_template(name)
+    return HTMLResponse(await template.render_async(context))
 
 
 async def get_current_user(request: Request):
@@ -52,15 +140,124 @@ def require_auth(user=Depends(get_current_user)):
     return user
 
 
-async def get_github_service(user=Depends(require_auth)) -> GitHubService:
+async def get_github_service(request: Request, user=Depends(require_auth)) -> GitHubService:
     """Get GitHub service for current user"""
-    return GitHubService(user['access_token'])
+    return GitHubService(user['access_token'], get_http_client(request), get_cache(request))
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the shared HTTP client"""
+    return request.app.state.http
+
+
+def get_cache(request: Request):
+    """Get the shared key/value cache"""
+    return request.app.state.cache
+
+
+# GitHub pagination helpers
+
+# Personal repositories are capped at 2 pages (200 repos)
+MAX_USER_REPO_PAGES = 2
+
+# Query parameters shared by every repository and organization listing
+REPO_LIST_PARAMS = {'sort': 'updated', 'per_page': 100, 'type': 'all'}
+ORG_LIST_PARAMS = {'per_page': 100}
+
+# How long a user's formatted repository list is reused
+REPO_LIST_TTL = 120
+
+
+async def fetch_all_repos(client: httpx.AsyncClient, cache, headers: dict) -> list:
+    """Fetch the user's personal and organization repositories concurrently"""
+    # 1. Personal repositories and organizations
+    user_repos, (orgs, _) = await asyncio.gather(
+        fetch_all_pages(
+            client, cache, 'https://api.github.com/user/repos', headers, REPO_LIST_PARAMS,
+            max_pages=MAX_USER_REPO_PAGES
+        ),
+        fetch_page(client, cache, 'https://api.github.com/user/orgs', headers, ORG_LIST_PARAMS, 1)
+    )
+
+    # 2. Repositories of every organization, fanned out together
+    org_repos = await asyncio.gather(*[
+        fetch_all_pages(client, cache, f"https://api.github.com/orgs/{org['login']}/repos", headers, REPO_LIST_PARAMS)
+        for org in orgs
+    ])
+
+    # Add org repos not already listed (user might be owner of org repo),
+    # keeping the personal listing's copy as before
+    all_repos = user_repos
+    existing_ids = {repo['id'] for repo in all_repos}
+    for repos in org_repos:
+        for repo in repos:
+            if repo['id'] not in existing_ids:
+                all_repos.append(repo)
+                existing_ids.add(repo['id'])
+
+    return all_repos
+
+
+def format_repo(repo: dict) -> dict:
+    """Keep the repository fields used by the UI"""
+    permissions = repo.get('permissions', {})
+    
+    return {
+        'id': repo['id'],
+        'name': repo['name'],
+        'full_name': repo['full_name'],
+        'description': repo.get('description'),
+        'html_url': repo['html_url'],
+        'clone_url': repo['clone_url'],
+        'private': repo['private'],
+        'language': repo.get('language'),
+        'updated_at': repo['updated_at'],
+        'stargazers_count': repo['stargazers_count'],
+        'forks_count': repo['forks_count'],
+        'fork': repo.get('fork', False),
+        'owner_type': repo['owner']['type'],  # User or Organization
+        'owner_login': repo['owner']['login'],
+        'permissions': {
+            'admin': permissions.get('admin', False),
+            'push': permissions.get('push', False),
+            'pull': permissions.get('pull', True)
+        }
+    }
+
+
+async def fetch_formatted_repos(
+    client: httpx.AsyncClient,
+    cache,
+    headers: dict,
+    user_id: int,
+    fresh: bool = False
+) -> list:
+    """Fetch and format the user's repositories, most recently updated first.
+
+    The list is cached per user for REPO_LIST_TTL seconds; pass fresh=True
+    to bypass the cached copy.
+    """
+    cache_key = f'repos:{user_id}'
+    if not fresh:
+        cached = await cache.get(cache_key)
+        if cached:
+            return orjson.loads(cached)
+    
+    logger.debug("Fetching user and organization repos")
+    all_repos = await fetch_all_repos(client, cache, headers)
+    logger.debug("Total repos found: %d", len(all_repos))
+    
+    formatted_repos = [format_repo(repo) for repo in all_repos]
+    formatted_repos.sort(key=lambda x: x['updated_at'], reverse=True)
+    
+    await cache.set(cache_key, orjson.dumps(formatted_repos), ex=REPO_LIST_TTL)
+    return formatted_repos
 
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request, user=Depends(get_current_user)):
     """Home page"""
-    return templates.TemplateResponse(
+    return await render_template(
         "index.html",
         {"request": request, "user": user}
     )
@@ -73,50 +270,49 @@ async def login(request: Request):
     return await oauth.github.authorize_redirect(request, redirect_uri)
 
 
+VIEWER_QUERY = "query { viewer { databaseId login name email avatarUrl } }"
+
+
 @app.get("/callback")
 async def callback(request: Request):
     """GitHub OAuth callback"""
     try:
         token = await oauth.github.authorize_access_token(request)
         
-        # Get user info from GitHub
-        async with httpx.AsyncClient() as client:
-            resp = await client.get(
-                'https://api.github.com/user',
-                headers={
-                    'Authorization': f'token {token["access_token"]}',
-                    'Accept': 'application/json'
-                }
+        # Get user info from GitHub in a single GraphQL round trip
+        client = request.app.state.http
+        access_token = token['access_token']
+        resp = await client.post(
+            'https://api.github.com/graphql',
+            headers={'Authorization': f'bearer {access_token}'},
+            json={'query': VIEWER_QUERY}
+        )
+        viewer = orjson.loads(resp.content)['data']['viewer']
+
+        # GraphQL only exposes the public profile email
+        email = viewer.get('email')
+        if not email:
+            email_resp = await client.get(
+                'https://api.github.com/user/emails',
+                headers={'Authorization': f'token {access_token}', 'Accept': 'application/json'}
             )
-            user_data = resp.json()
-            
-            # Get user email if not public
-            if not user_data.get('email'):
-                email_resp = await client.get(
-                    'https://api.github.com/user/emails',
-                    headers={
-                        'Authorization': f'token {token["access_token"]}',
-                        'Accept': 'application/json'
-                    }
-                )
-                emails = email_resp.json()
-                primary_email = next((e['email'] for e in emails if e['primary']), None)
-                user_data['email'] = primary_email
-        
+            emails = orjson.loads(email_resp.content)
+            email = next((e['email'] for e in emails if e['primary']), None)
+
         # Store user in session
         request.session['user'] = {
-            'id': user_data['id'],
-            'login': user_data['login'],
-            'name': user_data.get('name'),
-            'email': user_data.get('email'),
-            'avatar_url': user_data['avatar_url'],
-            'access_token': token['access_token']
+            'id': viewer['databaseId'],
+            'login': viewer['login'],
+            'name': viewer.get('name'),
+            'email': email,
+            'avatar_url': viewer['avatarUrl'],
+            'access_token': access_token
         }
         
         return RedirectResponse(url='/')
         
     except Exception as e:
-        print(f"OAuth error: {e}")
+        logger.error("OAuth error: %s", e)
         raise HTTPException(status_code=400, detail="Authentication failed")
 
 
@@ -136,7 +332,7 @@ async def profile(request: Request, user=Depends(get_current_user)):
     # Get user's contexts
     user_contexts = context_service.get_user_contexts(user['id'])
     
-    return templates.TemplateResponse(
+    return await render_template(
         "profile.html",
         {"request": request, "user": user, "contexts": user_contexts}
     )
@@ -160,20 +356,27 @@ async def create_context(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    # If GitHub repo URL provided, fetch repo info
-    if request.github_repo_url:
-        repo_info = await github_service.get_repo_info(request.github_repo_url)
+    # If GitHub repo URL provided, fetch repo info and contributors concurrently
+    parsed_repo = GitHubService.parse_repo_url(request.github_repo_url) if request.github_repo_url else None
+    if parsed_repo:
+        async with asyncio.TaskGroup() as tg:
+            repo_task = tg.create_task(github_service.get_repo_info(request.github_repo_url))
+            contributors_task = tg.create_task(github_service.get_contributors(*parsed_repo))
+        
+        repo_info = repo_task.result()
         if repo_info:
             context_service.set_context_repo(context.id, repo_info)
             
-            # Get contributors
-            contributors = await github_service.get_contributors(repo_info.owner, repo_info.name)
+            # The URL may use an old name or different casing than the canonical repo
+            contributors = contributors_task.result()
+            if (repo_info.owner.lower(), repo_info.name.lower()) != tuple(part.lower() for part in parsed_repo):
+                contributors = await github_service.get_contributors(repo_info.owner, repo_info.name)
             context_service.set_context_contributors(context.id, contributors)
     
     # Generate default files
     context_service.generate_default_files(context.id, github_service)
     
-    return context_service.get_context(context.id)
+    return context
 
 
 @app.get("/api/contexts")
@@ -293,122 +496,28 @@ async def delete_context_file(
 
 @app.get("/api/user/repositories-with-contexts")
 async def get_user_repositories_with_contexts(
+    fresh: bool = False,
     user=Depends(require_auth),
-    github_service: GitHubService = Depends(get_github_service)
+    github_service: GitHubService = Depends(get_github_service),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache=Depends(get_cache)
 ):
     """Get user's repositories and mark which ones have contexts"""
     try:
-        async with httpx.AsyncClient() as client:
-            all_repos = []
-            
-            # 1. Get user's personal repositories
-            page = 1
-            while len(all_repos) < 200:  # Reasonable limit
-                repos_resp = await client.get(
-                    'https://api.github.com/user/repos',
-                    headers=github_service.headers,
-                    params={
-                        'sort': 'updated',
-                        'per_page': 100,
-                        'type': 'all',
-                        'page': page
-                    }
-                )
-                
-                if repos_resp.status_code != 200:
-                    break
-                
-                repos_page = repos_resp.json()
-                if not repos_page:
-                    break
-                    
-                all_repos.extend(repos_page)
-                page += 1
-            
-            # 2. Get user's organizations and their repos
-            orgs_resp = await client.get(
-                'https://api.github.com/user/orgs',
-                headers=github_service.headers,
-                params={'per_page': 100}
-            )
-            
-            if orgs_resp.status_code == 200:
-                orgs = orgs_resp.json()
-                
-                for org in orgs:
-                    org_login = org['login']
-                    org_page = 1
-                    while True:
-                        org_repos_resp = await client.get(
-                            f'https://api.github.com/orgs/{org_login}/repos',
-                            headers=github_service.headers,
-                            params={
-                                'sort': 'updated',
-                                'per_page': 100,
-                                'type': 'all',
-                                'page': org_page
-                            }
-                        )
-                        
-                        if org_repos_resp.status_code != 200:
-                            break
-                            
-                        org_repos = org_repos_resp.json()
-                        if not org_repos:
-                            break
-                            
-                        existing_ids = {repo['id'] for repo in all_repos}
-                        new_org_repos = [repo for repo in org_repos if repo['id'] not in existing_ids]
-                        all_repos.extend(new_org_repos)
-                        
-                        org_page += 1
-                        if len(new_org_repos) < 100:
-                            break
-            
-            # 3. Format repositories
-            formatted_repos = []
-            repo_urls = []
-            for repo in all_repos:
-                permissions = repo.get('permissions', {})
-                
-                formatted_repo = {
-                    'id': repo['id'],
-                    'name': repo['name'],
-                    'full_name': repo['full_name'],
-                    'description': repo.get('description'),
-                    'html_url': repo['html_url'],
-                    'clone_url': repo['clone_url'],
-                    'private': repo['private'],
-                    'language': repo.get('language'),
-                    'updated_at': repo['updated_at'],
-                    'stargazers_count': repo['stargazers_count'],
-                    'forks_count': repo['forks_count'],
-                    'fork': repo.get('fork', False),
-                    'owner_type': repo['owner']['type'],
-                    'owner_login': repo['owner']['login'],
-                    'permissions': {
-                        'admin': permissions.get('admin', False),
-                        'push': permissions.get('push', False),
-                        'pull': permissions.get('pull', True)
-                    },
-                    'has_context': False,  # Will be updated below
-                    'context_id': None     # Will be updated below
-                }
-                formatted_repos.append(formatted_repo)
-                repo_urls.append(repo['html_url'])
-            
-            # 4. Check which repositories have contexts
-            repo_contexts = context_service.get_contexts_for_repos(user['id'], repo_urls)
-            for repo in formatted_repos:
-                if repo['html_url'] in repo_contexts:
-                    repo['has_context'] = True
-                    repo['context_id'] = repo_contexts[repo['html_url']]
-            
-            # Sort by updated date (most recent first)
-            formatted_repos.sort(key=lambda x: x['updated_at'], reverse=True)
-            
-            return formatted_repos
-            
+        formatted_repos = await fetch_formatted_repos(client, cache, github_service.headers, user['id'], fresh)
+        
+        # Check which repositories have contexts
+        repo_contexts = context_service.get_contexts_for_repos(
+            user['id'],
+            {repo['html_url'] for repo in formatted_repos}
+        )
+        for repo in formatted_repos:
+            context_id = repo_contexts.get(repo['html_url'])
+            repo['has_context'] = context_id is not None
+            repo['context_id'] = context_id
+        
+        return ORJSONResponse(formatted_repos)
+        
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=400, detail=f"GitHub API error: {e}")
     except Exception as e:
@@ -416,121 +525,20 @@ async def get_user_repositories_with_contexts(
 
 
 @app.get("/api/user/repositories")
-async def get_user_repositories(github_service: GitHubService = Depends(get_github_service)):
+async def get_user_repositories(
+    fresh: bool = False,
+    user=Depends(require_auth),
+    github_service: GitHubService = Depends(get_github_service),
+    client: httpx.AsyncClient = Depends(get_http_client),
+    cache=Depends(get_cache)
+):
     """Get all repositories the user has access to (owned, collaborator, organization)"""
     try:
-        async with httpx.AsyncClient() as client:
-            all_repos = []
-            
-            # 1. Get user's personal repositories
-            print("Fetching user repos...")
-            page = 1
-            while len(all_repos) < 200:  # Reasonable limit
-                repos_resp = await client.get(
-                    'https://api.github.com/user/repos',
-                    headers=github_service.headers,
-                    params={
-                        'sort': 'updated',
-                        'per_page': 100,
-                        'type': 'all',  # owner, collaborator, organization_member
-                        'page': page
-                    }
-                )
-                
-                if repos_resp.status_code != 200:
-                    break
-                
-                repos_page = repos_resp.json()
-                if not repos_page:  # No more repos
-                    break
-                    
-                all_repos.extend(repos_page)
-                page += 1
-            
-            # 2. Get user's organizations
-            print("Fetching user orgs...")
-            orgs_resp = await client.get(
-                'https://api.github.com/user/orgs',
-                headers=github_service.headers,
-                params={'per_page': 100}
-            )
-            
-            if orgs_resp.status_code == 200:
-                orgs = orgs_resp.json()
-                print(f"Found {len(orgs)} organizations")
-                
-                # 3. Get repositories for each organization
-                for org in orgs:
-                    org_login = org['login']
-                    print(f"Fetching repos for org: {org_login}")
-                    
-                    org_page = 1
-                    while True:
-                        org_repos_resp = await client.get(
-                            f'https://api.github.com/orgs/{org_login}/repos',
-                            headers=github_service.headers,
-                            params={
-                                'sort': 'updated',
-                                'per_page': 100,
-                                'type': 'all',  # all, public, private, forks, sources, member
-                                'page': org_page
-                            }
-                        )
-                        
-                        if org_repos_resp.status_code != 200:
-                            break
-                            
-                        org_repos = org_repos_resp.json()
-                        if not org_repos:
-                            break
-                            
-                        # Filter out repos already in our list (user might be owner of org repo)
-                        existing_ids = {repo['id'] for repo in all_repos}
-                        new_org_repos = [repo for repo in org_repos if repo['id'] not in existing_ids]
-                        all_repos.extend(new_org_repos)
-                        
-                        org_page += 1
-                        
-                        # Limit per org to avoid too many repos
-                        if len(new_org_repos) < 100:
-                            break
-            
-            print(f"Total repos found: {len(all_repos)}")
-            
-            # Filter and format repositories
-            filtered_repos = []
-            for repo in all_repos:
-                # Get permissions for the user
-                permissions = repo.get('permissions', {})
-                
-                filtered_repos.append({
-                    'id': repo['id'],
-                    'name': repo['name'],
-                    'full_name': repo['full_name'],
-                    'description': repo.get('description'),
-                    'html_url': repo['html_url'],
-                    'clone_url': repo['clone_url'],
-                    'private': repo['private'],
-                    'language': repo.get('language'),
-                    'updated_at': repo['updated_at'],
-                    'stargazers_count': repo['stargazers_count'],
-                    'forks_count': repo['forks_count'],
-                    'fork': repo.get('fork', False),
-                    'owner_type': repo['owner']['type'],  # User or Organization
-                    'owner_login': repo['owner']['login'],
-                    'permissions': {
-                        'admin': permissions.get('admin', False),
-                        'push': permissions.get('push', False),
-                        'pull': permissions.get('pull', True)
-                    }
-                })
-            
-            # Sort by updated date (most recent first)
-            filtered_repos.sort(key=lambda x: x['updated_at'], reverse=True)
-            
-            print(f"Returning {len(filtered_repos)} filtered repos")
-            return filtered_repos
-            
+        formatted_repos = await fetch_formatted_repos(client, cache, github_service.headers, user['id'], fresh)
+        
+        logger.debug("Returning %d filtered repos", len(formatted_repos))
+        return formatted_repos
+        
     except httpx.HTTPStatusError as e:
         raise HTTPException(status_code=400, detail=f"GitHub API error: {e}")
     except Exception as e:
@@ -562,25 +570,23 @@ async def toggle_contributor_selection(
     if not contributor_found:
         raise HTTPException(status_code=404, detail="Contributor not found")
     
-    # Save the context with updated contributor selection
-    context_service._save_context(context)
-    
-    # Regenerate people.md in real-time
+    # Regenerate people.md in real-time; this also saves the updated contributor selection
     people_content = context_service._generate_people_content(context)
     updated_file = context_service.update_context_file(
         context_id,
         "people.md",
         UpdateContextFileRequest(content=people_content)
     )
+    if not updated_file:
+        # No people.md to update, save the contributor selection on its own
+        context_service._save_context(context)
     
-    # Return the updated context with the new file content
-    updated_context = context_service.get_context(context_id)
-    
+    # The context is updated in place, no need to fetch it again
     return {
-        "context": updated_context,
+        "context": context,
         "updated_file": updated_file,
         "contributor_login": login,
-        "contributor_selected": next((c.selected for c in updated_context.contributors if c.login == login), False)
+        "contributor_selected": next((c.selected for c in context.contributors if c.login == login), False)
     }
 
 
@@ -609,13 +615,14 @@ async def create_pull_request(
             owner=repo_info.owner,
             repo=repo_info.name,
             context=context,
-            user_login=user['login']
+            user_login=user['login'],
+            default_branch=repo_info.default_branch
         )
         
         return {"pr_url": pr_url}
         
-    except Exception as e:
-        print(f"Error creating PR: {e}")
+    except GitHubError as e:
+        logger.error("Error creating PR: %s", e)
         raise HTTPException(status_code=500, detail=f"Error creating pull request: {str(e)}")
 
 
@@ -624,7 +631,7 @@ async def create_pull_request(
 @app.get("/repositories", response_class=HTMLResponse)
 async def repositories_page(request: Request, user=Depends(require_auth)):
     """Repositories listing page"""
-    return templates.TemplateResponse(
+    return await render_template(
         "repositories.html",
         {"request": request, "user": user}
     )
@@ -633,7 +640,7 @@ async def repositories_page(request: Request, user=Depends(require_auth)):
 @app.get("/contexts", response_class=HTMLResponse)
 async def contexts_page(request: Request, user=Depends(get_current_user)):
     """Contexts listing page"""
-    return templates.TemplateResponse(
+    return await render_template(
         "contexts.html",
         {"request": request, "user": user}
     )
@@ -642,7 +649,7 @@ async def contexts_page(request: Request, user=Depends(get_current_user)):
 @app.get("/contexts/new", response_class=HTMLResponse)
 async def new_context_page(request: Request, user=Depends(require_auth)):
     """New context creation page"""
-    return templates.TemplateResponse(
+    return await render_template(
         "new_context.html",
         {"request": request, "user": user}
     )
@@ -665,7 +672,7 @@ async def context_detail_page(
     
     can_edit = user and user['id'] == context.owner_id
     
-    return templates.TemplateResponse(
+    return await render_template(
         "context_detail.html",
         {
             "request": request,
@@ -690,7 +697,7 @@ async def edit_context_page(
     if user['id'] != context.owner_id:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    return templates.TemplateResponse(
+    return await render_template(
         "edit_context.html",
         {"request": request, "user": user, "context": context}
     )
@@ -704,14 +711,26 @@ if __name__ == "__main__":
     parser.add_argument("--host", default=settings.host, help="Host to bind to")
     parser.add_argument("--port", type=int, default=settings.port, help="Port to bind to")
     parser.add_argument("--reload", action="store_true", default=settings.debug, help="Enable auto-reload")
+    parser.add_argument("--workers", type=int, default=settings.workers, help="Number of worker processes")
     
     args = parser.parse_args()
     
+    # Each worker would hold its own copy of every context and flush it over the others' writes
+    if args.workers > 1:
+        parser.error("--workers > 1 is not supported until contexts are kept in a shared store")
+    
     if args.mcp:
         # Run MCP server
         from app.mcp_server import run_mcp_server
         base_url = f"http://{args.host}:{args.port}"
-        asyncio.run(run_mcp_server(base_url))
+        try:
+            import uvloop
+            loop_factory = uvloop.new_event_loop
+        except ImportError:
+            # uvloop is not available on Windows
+            loop_factory = None
+        with asyncio.Runner(loop_factory=loop_factory) as runner:
+            runner.run(run_mcp_server(base_url))
     else:
         # Run web server
         import uvicorn
@@ -719,5 +738,10 @@ if __name__ == "__main__":
             "app.main:app",
             host=args.host,
             port=args.port,
-            reload=args.reload
+            reload=args.reload,
+            # Auto-reload always runs a single worker
+            workers=1 if args.reload else args.workers,
+            # uvloop is not available on Windows
+            loop="uvloop" if sys.platform != "win32" else "auto",
+            http="httptools"
         )
\ No newline at end of file
@@ -5,352 +5,552 @@ Provides programmatic access to code contexts via the Model Context Protocol
 """
 
 import asyncio
-import json
+import base64
+import binascii
 import sys
-from typing import Any, Dict, List, Optional, Sequence
-from urllib.parse import urljoin
-import httpx
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from mcp.server import Server
 from mcp.server.models import InitializationOptions
 from mcp.server.stdio import stdio_server
-from mcp.types import (
-    Resource,
-    Tool,
-    TextContent,
-    ImageContent,
-    EmbeddedResource,
-    CallToolRequest,
-    ListResourcesRequest,
-    ListToolsRequest,
-    ReadResourceRequest,
-)
-from pydantic import BaseModel, Field
+from mcp.types import Resource, Tool, TextContent
 
+from app.models import Context
 from app.services import context_service
 
 
+# Page size used by the listing tools when no limit is given
+DEFAULT_PAGE_SIZE = 50
+
+# Default number of batch_execute operations run at once
+BATCH_MAX_CONCURRENT = 4
+
+# Number of rendered context views kept in memory
+RENDER_CACHE_SIZE = 256
+
+# Input schema properties shared by the paginated tools
+PAGINATION_PROPERTIES = {
+    "limit": {
+        "type": "integer",
+        "description": "Maximum number of results to return",
+        "default": DEFAULT_PAGE_SIZE,
+        "minimum": 1
+    },
+    "cursor": {
+        "type": "string",
+        "description": "next_cursor value from a previous call, to get the next page"
+    }
+}
+
+
+class ToolError(Exception):
+    """A tool call failed; the message is returned to the client as is"""
+
+
+def encode_cursor(offset: int) -> str:
+    """Encode a result offset as an opaque cursor"""
+    return base64.urlsafe_b64encode(str(offset).encode()).decode()
+
+
+def decode_cursor(cursor: Optional[str]) -> int:
+    """Decode an opaque cursor back to a result offset"""
+    if not cursor:
+        return 0
+    try:
+        offset = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if offset < 0:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return offset
+
+
+def paginate(items: Sequence, limit: int, cursor: Optional[str]) -> Tuple[list, Optional[str]]:
+    """Get one page of items and the cursor for the next page, if any"""
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+    offset = decode_cursor(cursor)
+    page = list(islice(items, offset, offset + limit))
+    next_cursor = encode_cursor(offset + limit) if offset + limit < len(items) else None
+    return page, next_cursor
+
+
+# Tools exposed by the server, built once since they never change
+TOOLS: List[Tool] = [
+    Tool(
+        name="search_contexts",
+        description="Search for contexts by name or description",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query for context name or description"
+                },
+                **PAGINATION_PROPERTIES
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="get_context_details",
+        description="Get detailed information about a specific context",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "context_id": {
+                    "type": "string",
+                    "description": "ID of the context to retrieve"
+                }
+            },
+            "required": ["context_id"]
+        }
+    ),
+    Tool(
+        name="list_contexts",
+        description="List all available contexts",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "public_only": {
+                    "type": "boolean",
+                    "description": "Whether to show only public contexts",
+                    "default": True
+                },
+                **PAGINATION_PROPERTIES
+            },
+            "required": []
+        }
+    ),
+    Tool(
+        name="get_context_files",
+        description="Get all files from a specific context",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "context_id": {
+                    "type": "string",
+                    "description": "ID of the context"
+                },
+                **PAGINATION_PROPERTIES
+            },
+            "required": ["context_id"]
+        }
+    ),
+    Tool(
+        name="batch_execute",
+        description="Run several of the other tools in one call",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operations": {
+                    "type": "array",
+                    "description": "Tool calls to run, results are returned in the same order",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "name": {
+                                "type": "string",
+                                "description": "Name of the tool to call"
+                            },
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for the tool"
+                            }
+                        },
+                        "required": ["name"]
+                    }
+                },
+                "maxConcurrent": {
+                    "type": "integer",
+                    "description": "Maximum number of operations running at once",
+                    "default": BATCH_MAX_CONCURRENT,
+                    "minimum": 1
+                },
+                "stopOnError": {
+                    "type": "boolean",
+                    "description": "Skip operations that have not started once one fails",
+                    "default": False
+                }
+            },
+            "required": ["operations"]
+        }
+    )
+]
+
+
 class ContextMarketplaceMCPServer:
     """MCP Server for Context Marketplace"""
     
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url.rstrip('/')
         self.server = Server("context-marketplace")
+        # (context id, view) -> (context.updated_at at render time, rendered text)
+        self._render_cache: "OrderedDict[Tuple[str, str], Tuple[datetime, Any]]" = OrderedDict()
         self._setup_handlers()
     
     def _setup_handlers(self):
         """Setup MCP server handlers"""
-        
-        @self.server.list_resources()
-        async def list_resources() -> List[Resource]:
-            """List all available context resources"""
-            try:
-                # Use the local context service instead of HTTP
-                all_contexts = list(context_service.contexts.values())
-                
-                resources = []
-                
-                for context in all_contexts:
-                    if context.is_public:  # Only show public contexts or implement auth
-                        resources.append(Resource(
-                            uri=f"context://{context.id}",
-                            name=f"Context: {context.name}",
-                            description=context.description or 'Code context',
-                            mimeType="application/json"
-                        ))
-                        
-                        # Add individual files as resources
-                        for file in context.files:
-                            resources.append(Resource(
-                                uri=f"context://{context.id}/files/{file.name}",
-                                name=f"{context.name}/{file.name}",
-                                description=f"File from context: {context.name}",
-                                mimeType="text/plain"
-                            ))
-                
-                return resources
-            except Exception as e:
-                print(f"Error listing resources: {e}", file=sys.stderr)
-                return []
-        
-        @self.server.read_resource()
-        async def read_resource(uri: str) -> str:
-            """Read a specific context resource"""
-            try:
-                if not uri.startswith("context://"):
-                    raise ValueError(f"Invalid URI scheme: {uri}")
-                
-                path = uri[10:]  # Remove "context://" prefix
-                
-                if "/files/" in path:
-                    # Reading a specific file
-                    context_id, file_path = path.split("/files/", 1)
-                    
-                    context = context_service.get_context(context_id)
-                    if not context:
-                        raise ValueError(f"Context not found: {context_id}")
-                    
-                    # Find the specific file
-                    for file in context.files:
-                        if file.name == file_path:
-                            return file.content
-                    
-                    raise ValueError(f"File not found: {file_path}")
-                else:
-                    # Reading entire context
-                    context_id = path
-                    
-                    context = context_service.get_context(context_id)
-                    if not context:
-                        raise ValueError(f"Context not found: {context_id}")
-                    
-                    # Format context as readable text
-                    output = f"# Context: {context.name}\\n\\n"
-                    
-                    if context.description:
-                        output += f"**Description:** {context.description}\\n\\n"
-                    
-                    output += f"**Owner:** @{context.owner_login}\\n"
-                    output += f"**Files:** {len(context.files)}\\n"
-                    output += f"**Public:** {'Yes' if context.is_public else 'No'}\\n\\n"
-                    
-                    if context.github_repo:
-                        repo = context.github_repo
-                        output += f"**GitHub Repository:** {repo.full_name}\\n"
-                        if repo.description:
-                            output += f"**Repo Description:** {repo.description}\\n"
-                        output += "\\n"
-                    
-                    # Add all files content
-                    output += "## Files\\n\\n"
-                    for file in context.files:
-                        output += f"### {file.name}\\n\\n"
-                        output += f"```\\n{file.content}\\n```\\n\\n"
-                    
-                    return output
+        self.server.list_resources()(self._handle_list_resources)
+        self.server.read_resource()(self._handle_read_resource)
+        self.server.list_tools()(self._handle_list_tools)
+        self.server.call_tool()(self._handle_call_tool)
+    
+    async def _handle_list_resources(self) -> List[Resource]:
+        """List all available context resources"""
+        try:
+            # Building one resource per file is CPU bound, keep it off the event loop
+            return await asyncio.to_thread(self._build_resources)
+        except Exception as e:
+            print(f"Error listing resources: {e}", file=sys.stderr)
+            return []
+    
+    async def _handle_read_resource(self, uri: str) -> str:
+        """Read a specific context resource"""
+        try:
+            if not uri.startswith("context://"):
+                raise ValueError(f"Invalid URI scheme: {uri}")
             
-            except Exception as e:
-                print(f"Error reading resource {uri}: {e}", file=sys.stderr)
-                raise
-        
-        @self.server.list_tools()
-        async def list_tools() -> List[Tool]:
-            """List available tools"""
-            return [
-                Tool(
-                    name="search_contexts",
-                    description="Search for contexts by name or description",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {
-                                "type": "string",
-                                "description": "Search query for context name or description"
-                            }
-                        },
-                        "required": ["query"]
-                    }
-                ),
-                Tool(
-                    name="get_context_details",
-                    description="Get detailed information about a specific context",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "context_id": {
-                                "type": "string",
-                                "description": "ID of the context to retrieve"
-                            }
-                        },
-                        "required": ["context_id"]
-                    }
-                ),
-                Tool(
-                    name="list_contexts",
-                    description="List all available contexts",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "public_only": {
-                                "type": "boolean",
-                                "description": "Whether to show only public contexts",
-                                "default": True
-                            }
-                        },
-                        "required": []
-                    }
-                ),
-                Tool(
-                    name="get_context_files",
-                    description="Get all files from a specific context",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "context_id": {
-                                "type": "string",
-                                "description": "ID of the context"
-                            }
-                        },
-                        "required": ["context_id"]
-                    }
-                )
-            ]
-        
-        @self.server.call_tool()
-        async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
-            """Handle tool calls"""
-            try:
-                if name == "search_contexts":
-                    return await self._search_contexts(arguments["query"])
+            path = uri[10:]  # Remove "context://" prefix
+            
+            if "/files/" in path:
+                # Reading a specific file
+                context_id, file_path = path.split("/files/", 1)
                 
-                elif name == "get_context_details":
-                    return await self._get_context_details(arguments["context_id"])
+                context = context_service.get_context(context_id)
+                if not context:
+                    raise ValueError(f"Context not found: {context_id}")
                 
-                elif name == "list_contexts":
-                    public_only = arguments.get("public_only", True)
-                    return await self._list_contexts(public_only)
+                file = context.get_file(file_path)
+                if file is None:
+                    raise ValueError(f"File not found: {file_path}")
+                return file.content
+            else:
+                # Reading entire context
+                context_id = path
                 
-                elif name == "get_context_files":
-                    return await self._get_context_files(arguments["context_id"])
+                context = context_service.get_context(context_id)
+                if not context:
+                    raise ValueError(f"Context not found: {context_id}")
                 
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
-            
-            except Exception as e:
-                return [TextContent(type="text", text=f"Error: {str(e)}")]
+                # Format context as readable text
+                return self._render_cached(context, "full", lambda ctx: "".join(self._iter_context_text(ctx)))
+        
+        except Exception as e:
+            print(f"Error reading resource {uri}: {e}", file=sys.stderr)
+            raise
+    
+    async def _handle_list_tools(self) -> List[Tool]:
+        """List available tools"""
+        return TOOLS
     
-    async def _search_contexts(self, query: str) -> List[TextContent]:
+    async def _handle_call_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Handle tool calls"""
+        try:
+            return await self._dispatch_tool(name, arguments)
+        except ToolError as e:
+            return [TextContent(type="text", text=str(e))]
+        except Exception as e:
+            return [TextContent(type="text", text=f"Error: {str(e)}")]
+    
+    async def _dispatch_tool(self, name: str, arguments: Dict[str, Any]) -> List[TextContent]:
+        """Run a tool by name, raising on unknown tools, missing arguments or failures"""
+        limit = arguments.get("limit", DEFAULT_PAGE_SIZE)
+        cursor = arguments.get("cursor")
+        
+        if name == "search_contexts":
+            return await self._search_contexts(arguments["query"], limit, cursor)
+        
+        elif name == "get_context_details":
+            return await self._get_context_details(arguments["context_id"])
+        
+        elif name == "list_contexts":
+            public_only = arguments.get("public_only", True)
+            return await self._list_contexts(public_only, limit, cursor)
+        
+        elif name == "get_context_files":
+            return await self._get_context_files(arguments["context_id"], limit, cursor)
+        
+        elif name == "batch_execute":
+            return await self._batch_execute(
+                arguments["operations"],
+                arguments.get("maxConcurrent", BATCH_MAX_CONCURRENT),
+                arguments.get("stopOnError", False)
+            )
+        
+        else:
+            raise ValueError(f"Unknown tool: {name}")
+    
+    async def _batch_execute(
+        self,
+        operations: List[Dict[str, Any]],
+        max_concurrent: int = BATCH_MAX_CONCURRENT,
+        stop_on_error: bool = False
+    ) -> List[TextContent]:
+        """Run several tool calls concurrently, returning one result per operation"""
+        if max_concurrent < 1:
+            raise ValueError("maxConcurrent must be at least 1")
+        
+        semaphore = asyncio.Semaphore(max_concurrent)
+        failed = asyncio.Event()
+        
+        async def run_operation(index: int, operation: Dict[str, Any]) -> TextContent:
+            name = operation.get("name")
+            header = f"## [{index}] {name}\n\n"
+            async with semaphore:
+                if stop_on_error and failed.is_set():
+                    return TextContent(type="text", text=f"{header}Skipped: an earlier operation failed")
+                try:
+                    if name == "batch_execute":
+                        raise ValueError("batch_execute cannot be nested")
+                    contents = await self._dispatch_tool(name, operation.get("arguments") or {})
+                except ToolError as e:
+                    failed.set()
+                    return TextContent(type="text", text=f"{header}{str(e)}")
+                except Exception as e:
+                    failed.set()
+                    return TextContent(type="text", text=f"{header}Error: {str(e)}")
+            return TextContent(type="text", text=header + "".join(content.text for content in contents))
+        
+        return list(await asyncio.gather(*(run_operation(i, op) for i, op in enumerate(operations))))
+    
+    async def _search_contexts(
+        self,
+        query: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> List[TextContent]:
         """Search for contexts"""
         try:
-            all_contexts = list(context_service.contexts.values())
-            
-            # Simple text search
-            query_lower = query.lower()
-            matching_contexts = []
-            
-            for context in all_contexts:
-                if not context.is_public:  # Skip private contexts
-                    continue
-                    
-                name_match = query_lower in context.name.lower()
-                desc_match = context.description and query_lower in context.description.lower()
-                
-                if name_match or desc_match:
-                    matching_contexts.append(context)
-            
-            if matching_contexts:
-                result = f"Found {len(matching_contexts)} contexts matching '{query}':\\n\\n"
-                for context in matching_contexts:
-                    result += f"**{context.name}** (ID: {context.id})\\n"
-                    if context.description:
-                        result += f"  Description: {context.description}\\n"
-                    result += f"  Owner: @{context.owner_login}\\n"
-                    result += f"  Files: {len(context.files)}\\n"
-                    result += f"  Public: {'Yes' if context.is_public else 'No'}\\n\\n"
-                
-                return [TextContent(type="text", text=result)]
-            else:
-                return [TextContent(type="text", text=f"No contexts found matching '{query}'")]
+            # Searching and formatting run in a worker thread to keep the stdio loop responsive
+            text = await asyncio.to_thread(self._render_search, query, limit, cursor)
+            return [TextContent(type="text", text=text)]
         except Exception as e:
-            return [TextContent(type="text", text=f"Error searching contexts: {str(e)}")]
+            raise ToolError(f"Error searching contexts: {str(e)}") from e
     
     async def _get_context_details(self, context_id: str) -> List[TextContent]:
         """Get detailed context information"""
+        context = context_service.get_context(context_id)
+        if not context:
+            raise ToolError(f"Context not found: {context_id}")
+        
+        if not context.is_public:
+            raise ToolError(f"Context is private: {context_id}")
+        
         try:
-            context = context_service.get_context(context_id)
-            if not context:
-                return [TextContent(type="text", text=f"Context not found: {context_id}")]
-            
-            if not context.is_public:
-                return [TextContent(type="text", text=f"Context is private: {context_id}")]
-            
-            result = f"# Context: {context.name}\\n\\n"
-            result += f"**ID:** {context.id}\\n"
-            
-            if context.description:
-                result += f"**Description:** {context.description}\\n"
-            
-            result += f"**Owner:** @{context.owner_login}\\n"
-            result += f"**Public:** {'Yes' if context.is_public else 'No'}\\n"
-            result += f"**Created:** {context.created_at}\\n"
-            result += f"**Updated:** {context.updated_at}\\n\\n"
-            
-            if context.github_repo:
-                repo = context.github_repo
-                result += f"**GitHub Repository:** {repo.full_name}\\n"
-                if repo.description:
-                    result += f"**Repo Description:** {repo.description}\\n"
-                if repo.language:
-                    result += f"**Primary Language:** {repo.language}\\n"
-                result += "\\n"
-            
-            result += f"## Files ({len(context.files)})\\n\\n"
-            for file in context.files:
-                result += f"- **{file.name}** ({file.file_type.value})\\n"
-                if len(file.content) > 200:
-                    result += f"  Preview: {file.content[:200]}...\\n"
-                else:
-                    result += f"  Content: {file.content}\\n"
-                result += "\\n"
-            
-            return [TextContent(type="text", text=result)]
+            text = self._render_cached(context, "details", self._render_details)
+            return [TextContent(type="text", text=text)]
         except Exception as e:
-            return [TextContent(type="text", text=f"Error getting context details: {str(e)}")]
+            raise ToolError(f"Error getting context details: {str(e)}") from e
     
-    async def _list_contexts(self, public_only: bool) -> List[TextContent]:
+    async def _list_contexts(
+        self,
+        public_only: bool,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> List[TextContent]:
         """List all contexts"""
         try:
-            all_contexts = list(context_service.contexts.values())
-            
-            if public_only:
-                contexts = [ctx for ctx in all_contexts if ctx.is_public]
-            else:
-                contexts = all_contexts
-            
-            if contexts:
-                result = f"Found {len(contexts)} contexts:\\n\\n"
-                
-                for context in contexts:
-                    result += f"**{context.name}** (ID: {context.id})\\n"
-                    if context.description:
-                        result += f"  Description: {context.description}\\n"
-                    result += f"  Owner: @{context.owner_login}\\n"
-                    result += f"  Files: {len(context.files)}\\n"
-                    result += f"  Public: {'Yes' if context.is_public else 'No'}\\n"
-                    
-                    if context.github_repo:
-                        result += f"  Repository: {context.github_repo.full_name}\\n"
-                    
-                    result += "\\n"
-                
-                return [TextContent(type="text", text=result)]
-            else:
-                return [TextContent(type="text", text="No contexts found")]
+            # Listing and formatting run in a worker thread to keep the stdio loop responsive
+            text = await asyncio.to_thread(self._render_list, public_only, limit, cursor)
+            return [TextContent(type="text", text=text)]
         except Exception as e:
-            return [TextContent(type="text", text=f"Error listing contexts: {str(e)}")]
+            raise ToolError(f"Error listing contexts: {str(e)}") from e
     
-    async def _get_context_files(self, context_id: str) -> List[TextContent]:
+    async def _get_context_files(
+        self,
+        context_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> List[TextContent]:
         """Get all files from a context"""
+        context = context_service.get_context(context_id)
+        if not context:
+            raise ToolError(f"Context not found: {context_id}")
+        
+        if not context.is_public:
+            raise ToolError(f"Context is private: {context_id}")
+        
+        if not context.files_by_name:
+            return [TextContent(type="text", text=f"No files found in context: {context.name}")]
+        
         try:
-            context = context_service.get_context(context_id)
-            if not context:
-                return [TextContent(type="text", text=f"Context not found: {context_id}")]
-            
-            if not context.is_public:
-                return [TextContent(type="text", text=f"Context is private: {context_id}")]
-            
-            if not context.files:
-                return [TextContent(type="text", text=f"No files found in context: {context.name}")]
-            
-            result = f"# Files from Context: {context.name}\\n\\n"
+            view = f"files:{decode_cursor(cursor)}:{limit}"
+            texts = self._render_cached(context, view, lambda ctx: self._render_files(ctx, limit, cursor))
+            return [TextContent(type="text", text=text) for text in texts]
+        except Exception as e:
+            raise ToolError(f"Error getting context files: {str(e)}") from e
+    
+    def _build_resources(self) -> List[Resource]:
+        """Build the resource list for public contexts and their files"""
+        # Use the local context service instead of HTTP
+        # Only show public contexts or implement auth
+        public_contexts = context_service.get_public_contexts()
+        
+        resources = []
+        
+        for context in public_contexts:
+            resources.append(Resource(
+                uri=f"context://{context.id}",
+                name=f"Context: {context.name}",
+                description=context.description or 'Code context',
+                mimeType="application/json"
+            ))
             
+            # Add individual files as resources
             for file in context.files:
-                result += f"## {file.name} ({file.file_type.value})\\n\\n"
-                result += f"```\\n{file.content}\\n```\\n\\n"
-            
-            return [TextContent(type="text", text=result)]
-        except Exception as e:
-            return [TextContent(type="text", text=f"Error getting context files: {str(e)}")]
+                resources.append(Resource(
+                    uri=f"context://{context.id}/files/{file.name}",
+                    name=f"{context.name}/{file.name}",
+                    description=f"File from context: {context.name}",
+                    mimeType="text/plain"
+                ))
+        
+        return resources
+    
+    def _render_search(self, query: str, limit: int, cursor: Optional[str]) -> str:
+        """Search public contexts and render one page of results"""
+        # Simple text search over public contexts, stopping once we know whether there is a next page
+        offset = decode_cursor(cursor)
+        matching_contexts = context_service.search_public_contexts(query, limit=offset + limit + 1)
+        page, next_cursor = paginate(matching_contexts, limit, cursor)
+        
+        if not page:
+            return f"No contexts found matching '{query}'"
+        
+        parts = [f"Showing {len(page)} contexts matching '{query}':\n\n"]
+        for context in page:
+            self._format_summary(parts, context, show_repo=False)
+        
+        if next_cursor:
+            parts.append(f"next_cursor: {next_cursor}\n")
+        
+        return "".join(parts)
+    
+    def _render_list(self, public_only: bool, limit: int, cursor: Optional[str]) -> str:
+        """Render one page of the context listing"""
+        if public_only:
+            contexts = context_service.get_public_contexts()
+        else:
+            contexts = list(context_service.contexts.values())
+        page, next_cursor = paginate(contexts, limit, cursor)
+        
+        if not page:
+            return "No contexts found"
+        
+        parts = [f"Found {len(contexts)} contexts:\n\n"]
+        
+        for context in page:
+            self._format_summary(parts, context, show_repo=True)
+        
+        if next_cursor:
+            parts.append(f"next_cursor: {next_cursor}\n")
+        
+        return "".join(parts)
+    
+    def _format_summary(self, parts: List[str], context: Context, show_repo: bool) -> None:
+        """Append the short summary of a context used by listings and search results"""
+        parts.append(f"**{context.name}** (ID: {context.id})\n")
+        if context.description:
+            parts.append(f"  Description: {context.description}\n")
+        parts.append(f"  Owner: @{context.owner_login}\n")
+        parts.append(f"  Files: {len(context.files_by_name)}\n")
+        parts.append(f"  Public: {'Yes' if context.is_public else 'No'}\n")
+        
+        if show_repo and context.github_repo:
+            parts.append(f"  Repository: {context.github_repo.full_name}\n")
+        
+        parts.append("\n")
+    
+    def _render_cached(self, context: Context, view: str, render: Callable[[Context], Any]) -> Any:
+        """Render a view of a context, reusing the last rendering if the context is unchanged"""
+        key = (context.id, view)
+        cached = self._render_cache.get(key)
+        if cached and cached[0] == context.updated_at:
+            self._render_cache.move_to_end(key)
+            return cached[1]
+        
+        text = render(context)
+        self._render_cache[key] = (context.updated_at, text)
+        self._render_cache.move_to_end(key)
+        if len(self._render_cache) > RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return text
+    
+    def _iter_context_text(self, context: Context) -> Iterator[str]:
+        """Yield a context and the content of all its files as text fragments"""
+        yield f"# Context: {context.name}\n\n"
+        
+        if context.description:
+            yield f"**Description:** {context.description}\n\n"
+        
+        yield f"**Owner:** @{context.owner_login}\n"
+        yield f"**Files:** {len(context.files_by_name)}\n"
+        yield f"**Public:** {'Yes' if context.is_public else 'No'}\n\n"
+        
+        if context.github_repo:
+            repo = context.github_repo
+            yield f"**GitHub Repository:** {repo.full_name}\n"
+            if repo.description:
+                yield f"**Repo Description:** {repo.description}\n"
+            yield "\n"
+        
+        # Add all files content, yielding file contents as-is rather than copying them
+        yield "## Files\n\n"
+        for file in context.files:
+            yield f"### {file.name}\n\n```\n"
+            yield file.content
+            yield "\n```\n\n"
+    
+    def _render_details(self, context: Context) -> str:
+        """Render context details with a short preview of each file"""
+        parts = [f"# Context: {context.name}\n\n"]
+        parts.append(f"**ID:** {context.id}\n")
+        
+        if context.description:
+            parts.append(f"**Description:** {context.description}\n")
+        
+        parts.append(f"**Owner:** @{context.owner_login}\n")
+        parts.append(f"**Public:** {'Yes' if context.is_public else 'No'}\n")
+        parts.append(f"**Created:** {context.created_at}\n")
+        parts.append(f"**Updated:** {context.updated_at}\n\n")
+        
+        if context.github_repo:
+            repo = context.github_repo
+            parts.append(f"**GitHub Repository:** {repo.full_name}\n")
+            if repo.description:
+                parts.append(f"**Repo Description:** {repo.description}\n")
+            if repo.language:
+                parts.append(f"**Primary Language:** {repo.language}\n")
+            parts.append("\n")
+        
+        parts.append(f"## Files ({len(context.files_by_name)})\n\n")
+        for file in context.files:
+            parts.append(f"- **{file.name}** ({file.file_type.value})\n")
+            if len(file.content) > 200:
+                parts.append(f"  Preview: {file.content[:200]}...\n")
+            else:
+                parts.append(f"  Content: {file.content}\n")
+            parts.append("\n")
+        
+        return "".join(parts)
+    
+    def _render_files(self, context: Context, limit: int, cursor: Optional[str]) -> Tuple[str, ...]:
+        """Render one page of a context's files, one text per file"""
+        page, next_cursor = paginate(context.files, limit, cursor)
+        
+        texts = [f"# Files from Context: {context.name}\n\n"]
+        
+        for file in page:
+            texts.append("".join((f"## {file.name} ({file.file_type.value})\n\n```\n", file.content, "\n```\n\n")))
+        
+        if next_cursor:
+            texts.append(f"next_cursor: {next_cursor}\n")
+        
+        return tuple(texts)
     
     async def run(self):
         """Run the MCP server"""
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, computed_field, model_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -53,6 +53,17 @@ class GitHubContributor(BaseModel):
     selected: bool = False
 
 
+def key_files_by_name(data: Any) -> Any:
+    """Accept a `files` list on input, keyed by file name"""
+    if isinstance(data, dict) and 'files' in data:
+        data = dict(data)
+        data['files_by_name'] = {
+            (file_obj.name if isinstance(file_obj, ContextFile) else file_obj['name']): file_obj
+            for file_obj in data.pop('files')
+        }
+    return data
+
+
 class Context(BaseModel):
     id: str
     name: str
@@ -60,11 +71,32 @@ class Context(BaseModel):
     owner_id: int
     owner_login: str
     github_repo: Optional[GitHubRepo] = None
-    files: List[ContextFile] = Field(default_factory=list)
+    # Files keyed by name, serialized as the `files` list
+    files_by_name: Dict[str, ContextFile] = Field(default_factory=dict, exclude=True)
     contributors: List[GitHubContributor] = Field(default_factory=list)
     is_public: bool = True
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
+    
+    _key_files_by_name = model_validator(mode='before')(key_files_by_name)
+    
+    @computed_field
+    @property
+    def files(self) -> List[ContextFile]:
+        """Files in the order they were added"""
+        return list(self.files_by_name.values())
+    
+    def get_file(self, name: str) -> Optional[ContextFile]:
+        """Get a file by name"""
+        return self.files_by_name.get(name)
+    
+    def put_file(self, file_obj: ContextFile) -> None:
+        """Add a file, replacing any existing file with the same name"""
+        self.files_by_name[file_obj.name] = file_obj
+    
+    def drop_file(self, name: str) -> bool:
+        """Remove a file by name, returning whether it existed"""
+        return self.files_by_name.pop(name, None) is not None
 
 
 class CreateContextRequest(BaseModel):
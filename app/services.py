@@ -1,10 +1,20 @@
+import asyncio
+import bisect
+import hashlib
 import httpx
+import logging
+import orjson
 import uuid
 import os
 import re
-from typing import List, Optional, Dict, Any
+import sqlite3
+import threading
+from typing import List, Optional, Dict, Any, Iterator, Set, Tuple
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlencode
+
+from jinja2 import Environment
 
 from app.models import (
     Context, ContextFile, GitHubRepo, GitHubContributor, 
@@ -12,207 +22,498 @@ from app.models import (
     CreateContextFileRequest, UpdateContextFileRequest, GenerateFileRequest
 )
 
+logger = logging.getLogger(__name__)
+
+
+# GitHub request helpers
+
+# Caps concurrent GitHub requests issued by a single process
+GITHUB_LIMIT = asyncio.Semaphore(8)
+
+# Access tokens GitHub asked us to back off, each mapped to an event set when the pause ends.
+# GitHub rate limits apply per token, so one user's pause never holds up another's requests.
+RATE_PAUSES: Dict[str, asyncio.Event] = {}
+
+# How long ETag-validated GitHub responses are kept
+ETAG_TTL = 24 * 60 * 60
+
+# Contributors shown per context, and the largest page size GitHub allows
+MAX_CONTRIBUTORS = 10
+GITHUB_MAX_PER_PAGE = 100
+
+# How long repository details are reused without asking GitHub again
+REPO_INFO_TTL = 5 * 60
+
+# Default wait before retrying after hitting GitHub's secondary rate limit
+SECONDARY_RATE_LIMIT_WAIT = 5
+
+# Below this many remaining requests in the rate limit window, requests are spaced out
+LOW_RATE_LIMIT_REMAINING = 50
+LOW_RATE_LIMIT_DELAY = 1
+
+
+def is_rate_limited(resp: httpx.Response) -> bool:
+    """Whether GitHub rejected a request and asked us to retry later"""
+    if resp.status_code == 429:
+        return True
+    return resp.status_code == 403 and (
+        'Retry-After' in resp.headers or 'secondary rate limit' in resp.text.lower()
+    )
+
+
+def rate_limit_key(headers: Optional[dict]) -> str:
+    """Get the access token a request is rate limited under ('token x' and 'bearer x' share one)"""
+    authorization = (headers or {}).get('Authorization', '')
+    return authorization.split(' ')[-1]
+
+
+async def pause_github_requests(key: str, seconds: int) -> None:
+    """Hold a token's GitHub requests for a while, unless another task is already doing so"""
+    pause = RATE_PAUSES.get(key)
+    if pause is not None:
+        await pause.wait()
+        return
+
+    pause = RATE_PAUSES[key] = asyncio.Event()
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        del RATE_PAUSES[key]
+        pause.set()
+
+
+async def send_github_request(client: httpx.AsyncClient, key: str, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send one request under GITHUB_LIMIT once any pause for its token is over"""
+    pause = RATE_PAUSES.get(key)
+    if pause is not None:
+        await pause.wait()
+
+    async with GITHUB_LIMIT:
+        return await client.request(method, url, **kwargs)
+
+
+async def gh_request(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a GitHub request, retrying once when rate limited.
+
+    Backoffs are waited out without holding a GITHUB_LIMIT slot, so a
+    throttled token never slows down requests made with other tokens.
+    """
+    key = rate_limit_key(kwargs.get('headers'))
+    resp = await send_github_request(client, key, method, url, **kwargs)
+
+    if is_rate_limited(resp):
+        await pause_github_requests(key, int(resp.headers.get('Retry-After', SECONDARY_RATE_LIMIT_WAIT)))
+        resp = await send_github_request(client, key, method, url, **kwargs)
+
+    # Space this token's requests out before its quota runs dry
+    remaining = resp.headers.get('X-RateLimit-Remaining')
+    if remaining is not None and int(remaining) < LOW_RATE_LIMIT_REMAINING:
+        await asyncio.sleep(LOW_RATE_LIMIT_DELAY)
+
+    return resp
+
+
+async def gh_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET a GitHub resource through gh_request"""
+    return await gh_request(client, 'GET', url, **kwargs)
+
+
+async def cached_get_json(
+    client: httpx.AsyncClient,
+    cache,
+    url: str,
+    headers: dict,
+    params: Optional[dict] = None
+) -> Tuple[int, Any, dict]:
+    """GET a GitHub resource, revalidating any cached copy with its ETag.
+
+    Returns the status code, decoded JSON and parsed Link header; a 304
+    answer is served from the cache as a 200. Entries are keyed per access
+    token so users never see each other's listings.
+    """
+    query = urlencode(sorted(params.items())) if params else ''
+    key = 'gh:etag:' + hashlib.sha1(f"{headers.get('Authorization')} {url}?{query}".encode('utf-8')).hexdigest()
+
+    cached = await cache.get(key)
+    entry = orjson.loads(cached) if cached else None
+    if entry:
+        headers = {**headers, 'If-None-Match': entry['etag']}
+
+    resp = await gh_get(client, url, headers=headers, params=params)
+
+    if resp.status_code == 304 and entry:
+        return 200, entry['data'], entry['links']
+
+    if resp.status_code != 200:
+        return resp.status_code, None, {}
+
+    data = orjson.loads(resp.content)
+    links = resp.links
+    etag = resp.headers.get('ETag')
+    if etag:
+        await cache.set(key, orjson.dumps({'etag': etag, 'data': data, 'links': links}), ex=ETAG_TTL)
+
+    return 200, data, links
+
+
+def last_page_number(links: dict) -> int:
+    """Get the last page advertised by a GitHub Link header (1 when there is no other page)"""
+    last = links.get('last')
+    if not last:
+        return 1
+
+    return int(httpx.URL(last['url']).params.get('page', 1))
+
+
+async def fetch_page(
+    client: httpx.AsyncClient,
+    cache,
+    url: str,
+    headers: dict,
+    params: dict,
+    page: int
+) -> Tuple[list, int]:
+    """Fetch a single page of a paginated GitHub listing.
+
+    Returns the page items (empty on error) and the last page number.
+    """
+    status_code, data, links = await cached_get_json(client, cache, url, headers, {**params, 'page': page})
+
+    if status_code != 200:
+        return [], page
+
+    return data, last_page_number(links)
+
+
+async def fetch_all_pages(
+    client: httpx.AsyncClient,
+    cache,
+    url: str,
+    headers: dict,
+    params: dict,
+    max_pages: Optional[int] = None
+) -> list:
+    """Fetch every page of a GitHub listing.
+
+    The first page's Link header gives the last page number, so all the
+    remaining pages are requested concurrently in one go.
+    """
+    first_page, last_page = await fetch_page(client, cache, url, headers, params, 1)
+    if max_pages is not None:
+        last_page = min(last_page, max_pages)
+
+    other_pages = await asyncio.gather(*[
+        fetch_page(client, cache, url, headers, params, page)
+        for page in range(2, last_page + 1)
+    ])
+
+    return first_page + [item for items, _ in other_pages for item in items]
+
+
+class GitHubError(Exception):
+    """A GitHub operation could not be completed"""
+
+
+# Failed requests and unexpected GitHub payloads, handled by GitHubService methods
+GITHUB_ERRORS = (httpx.HTTPError, KeyError, TypeError, ValueError)
+
+# Media type for fetching file contents as raw bytes
+RAW_MEDIA_TYPE = 'application/vnd.github.raw'
+
+# Matches HTTPS and SSH GitHub repository URLs, capturing owner and repo
+GITHUB_URL_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+# Profile fields fetched for each contributor in the GraphQL users query
+CONTRIBUTOR_FIELDS = (
+    "name email bio pronouns company websiteUrl location twitterUsername isHireable createdAt "
+    "repositories(privacy: PUBLIC) { totalCount } followers { totalCount } following { totalCount }"
+)
+
 
 class GitHubService:
-    def __init__(self, access_token: str):
+    def __init__(self, access_token: str, client: httpx.AsyncClient, cache):
         self.access_token = access_token
+        # Shared client, so requests reuse pooled connections
+        self.client = client
+        # Shared key/value cache holding ETag-validated responses
+        self.cache = cache
         self.headers = {
             'Authorization': f'token {access_token}',
             'Accept': 'application/json'
         }
     
+    @staticmethod
+    def parse_repo_url(repo_url: str) -> Optional[Tuple[str, str]]:
+        """Get (owner, repo) from a GitHub URL"""
+        match = GITHUB_URL_RE.search(repo_url)
+        if not match:
+            return None
+        return match.group(1), match.group(2)
+    
     async def get_repo_info(self, repo_url: str) -> Optional[GitHubRepo]:
         """Extract repo info from GitHub URL and fetch details"""
         try:
             # Parse GitHub URL to get owner/repo
-            match = re.search(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$', repo_url)
-            if not match:
+            parsed = self.parse_repo_url(repo_url)
+            if not parsed:
                 return None
             
-            owner, repo = match.groups()
+            owner, repo = parsed
             
-            async with httpx.AsyncClient() as client:
-                # Get repository details
-                repo_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}',
-                    headers=self.headers
-                )
-                
-                if repo_resp.status_code != 200:
-                    return None
-                
-                repo_data = repo_resp.json()
-                
-                # Get languages
-                lang_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/languages',
-                    headers=self.headers
-                )
-                languages = lang_resp.json() if lang_resp.status_code == 200 else {}
-                
-                return GitHubRepo(
-                    owner=repo_data['owner']['login'],
-                    name=repo_data['name'],
-                    full_name=repo_data['full_name'],
-                    description=repo_data.get('description'),
-                    url=repo_data['html_url'],
-                    clone_url=repo_data['clone_url'],
-                    default_branch=repo_data['default_branch'],
-                    language=repo_data.get('language'),
-                    languages=languages
-                )
-        except Exception as e:
-            print(f"Error fetching repo info: {e}")
+            # Repository details are cached per access token, since visibility differs between users
+            cache_key = 'gh:repo:' + hashlib.sha1(f"{self.access_token} {owner.lower()}/{repo.lower()}".encode('utf-8')).hexdigest()
+            cached = await self.cache.get(cache_key)
+            if cached:
+                return GitHubRepo.model_validate_json(cached)
+            
+            # Get repository details
+            status_code, repo_data = await self._get_json(f'https://api.github.com/repos/{owner}/{repo}')
+            
+            if status_code != 200:
+                return None
+            
+            # Get languages
+            languages_status, languages = await self._get_json(f'https://api.github.com/repos/{owner}/{repo}/languages')
+            if languages_status != 200:
+                languages = {}
+            
+            repo_info = GitHubRepo(
+                owner=repo_data['owner']['login'],
+                name=repo_data['name'],
+                full_name=repo_data['full_name'],
+                description=repo_data.get('description'),
+                url=repo_data['html_url'],
+                clone_url=repo_data['clone_url'],
+                default_branch=repo_data['default_branch'],
+                language=repo_data.get('language'),
+                languages=languages
+            )
+            # A failed languages call must not be served from the cache
+            if languages_status == 200:
+                await self.cache.set(cache_key, repo_info.model_dump_json(), ex=REPO_INFO_TTL)
+            return repo_info
+        except GITHUB_ERRORS:
+            logger.warning("Error fetching repo info for %s", repo_url, exc_info=True)
             return None
     
-    async def get_contributors(self, owner: str, repo: str) -> List[GitHubContributor]:
-        """Get repository contributors"""
+    async def get_contributors(self, owner: str, repo: str, limit: int = MAX_CONTRIBUTORS) -> List[GitHubContributor]:
+        """Get the top repository contributors"""
         try:
-            async with httpx.AsyncClient() as client:
-                contributors_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/contributors',
-                    headers=self.headers
-                )
-                
-                if contributors_resp.status_code != 200:
-                    return []
-                
-                contributors_data = contributors_resp.json()
-                contributors = []
-                
-                for contrib in contributors_data[:10]:  # Limit to top 10 contributors
-                    # Get detailed user info
-                    user_resp = await client.get(
-                        contrib['url'],
-                        headers=self.headers
-                    )
-                    
-                    user_data = user_resp.json() if user_resp.status_code == 200 else {}
-                    
-                    contributors.append(GitHubContributor(
-                        login=contrib['login'],
-                        id=contrib['id'],
-                        avatar_url=contrib['avatar_url'],
-                        name=user_data.get('name'),
-                        email=user_data.get('email'),
-                        bio=user_data.get('bio'),
-                        pronouns=user_data.get('pronouns'),
-                        company=user_data.get('company'),
-                        website=user_data.get('blog'),  # GitHub API uses 'blog' for website
-                        location=user_data.get('location'),
-                        twitter_username=user_data.get('twitter_username'),
-                        public_repos=user_data.get('public_repos'),
-                        followers=user_data.get('followers'),
-                        following=user_data.get('following'),
-                        created_at=user_data.get('created_at'),
-                        hireable=user_data.get('hireable'),
-                        contributions=contrib['contributions']
-                    ))
-                
-                return contributors
-        except Exception as e:
-            print(f"Error fetching contributors: {e}")
+            # Ask for just the limit, paging (all but the first page concurrently) only past GitHub's page size
+            per_page = min(limit, GITHUB_MAX_PER_PAGE)
+            contributors_data = await fetch_all_pages(
+                self.client, self.cache, f'https://api.github.com/repos/{owner}/{repo}/contributors',
+                self.headers, {'per_page': per_page},
+                max_pages=-(-limit // per_page)
+            )
+            
+            contributors_data = contributors_data[:limit]
+            if not contributors_data:
+                return []
+            contributors = []
+            
+            # Get detailed user info in one GraphQL query, falling back to one REST call per user
+            users_data = await self._get_users_graphql([contrib['login'] for contrib in contributors_data])
+            if users_data is None:
+                users_data = await self._get_users_rest(contributors_data)
+            
+            for contrib, user_data in zip(contributors_data, users_data):
+                contributors.append(GitHubContributor(
+                    login=contrib['login'],
+                    id=contrib['id'],
+                    avatar_url=contrib['avatar_url'],
+                    name=user_data.get('name'),
+                    email=user_data.get('email'),
+                    bio=user_data.get('bio'),
+                    pronouns=user_data.get('pronouns'),
+                    company=user_data.get('company'),
+                    website=user_data.get('blog'),  # GitHub API uses 'blog' for website
+                    location=user_data.get('location'),
+                    twitter_username=user_data.get('twitter_username'),
+                    public_repos=user_data.get('public_repos'),
+                    followers=user_data.get('followers'),
+                    following=user_data.get('following'),
+                    created_at=user_data.get('created_at'),
+                    hireable=user_data.get('hireable'),
+                    contributions=contrib['contributions']
+                ))
+            
+            return contributors
+        except GITHUB_ERRORS:
+            logger.warning("Error fetching contributors for %s/%s", owner, repo, exc_info=True)
             return []
     
+    async def _get_json(self, url: str) -> Tuple[int, Any]:
+        """GET a GitHub API resource, revalidating any cached copy with its ETag"""
+        status_code, data, _ = await cached_get_json(self.client, self.cache, url, self.headers)
+        return status_code, data
+    
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Run a GraphQL query, returning its data or None if the request failed"""
+        try:
+            resp = await gh_request(
+                self.client,
+                'POST',
+                'https://api.github.com/graphql',
+                headers={'Authorization': f'bearer {self.access_token}'},
+                json={'query': query, 'variables': variables}
+            )
+        except httpx.HTTPError:
+            return None
+        if resp.status_code != 200:
+            return None
+        return orjson.loads(resp.content).get('data')
+    
+    async def _get_users_graphql(self, logins: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """Get REST-shaped user details for several logins in a single GraphQL query"""
+        params = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+        users = " ".join(f"u{i}: user(login: $l{i}) {{ {CONTRIBUTOR_FIELDS} }}" for i in range(len(logins)))
+        data = await self._graphql(
+            f"query({params}) {{ {users} }}",
+            {f"l{i}": login for i, login in enumerate(logins)}
+        )
+        if data is None:
+            return None
+        
+        users_data = []
+        for i in range(len(logins)):
+            # Bots and other non-user accounts resolve to null
+            user = data.get(f"u{i}")
+            if not user:
+                users_data.append({})
+                continue
+            users_data.append({
+                'name': user['name'],
+                'email': user['email'] or None,  # GraphQL uses "" for no public email
+                'bio': user['bio'],
+                'pronouns': user['pronouns'],
+                'company': user['company'],
+                'blog': user['websiteUrl'],
+                'location': user['location'],
+                'twitter_username': user['twitterUsername'],
+                'public_repos': user['repositories']['totalCount'],
+                'followers': user['followers']['totalCount'],
+                'following': user['following']['totalCount'],
+                'created_at': user['createdAt'],
+                'hireable': user['isHireable'],
+            })
+        return users_data
+    
+    async def _get_users_rest(self, contributors_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Get user details for each contributor with concurrent REST calls"""
+        results = await asyncio.gather(
+            *(self._get_json(contrib['url']) for contrib in contributors_data),
+            return_exceptions=True
+        )
+        return [
+            {} if isinstance(result, Exception) or result[0] != 200 else result[1]
+            for result in results
+        ]
+    
     async def get_file_content(self, owner: str, repo: str, path: str) -> Optional[str]:
         """Get content of a specific file from the repository"""
         try:
-            async with httpx.AsyncClient() as client:
-                file_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/contents/{path}',
-                    headers=self.headers
-                )
-                
-                if file_resp.status_code != 200:
-                    return None
-                
-                file_data = file_resp.json()
-                
-                if file_data.get('type') != 'file':
-                    return None
-                
-                import base64
-                content = base64.b64decode(file_data['content']).decode('utf-8')
-                return content
-        except Exception as e:
-            print(f"Error fetching file content: {e}")
+            # The raw media type returns the file bytes directly instead of base64 inside JSON
+            resp = await gh_get(
+                self.client,
+                f'https://api.github.com/repos/{owner}/{repo}/contents/{path}',
+                headers={**self.headers, 'Accept': RAW_MEDIA_TYPE}
+            )
+            
+            if resp.status_code != 200:
+                return None
+            
+            # Directories and other non-file entries are still described as JSON
+            if resp.headers.get('Content-Type', '').startswith('application/json'):
+                return None
+            
+            return resp.content.decode('utf-8')
+        except GITHUB_ERRORS:
+            logger.warning("Error fetching %s from %s/%s", path, owner, repo, exc_info=True)
             return None
     
-    async def create_context_pr(self, owner: str, repo: str, context, user_login: str) -> str:
-        """Create a pull request with context files"""
+    async def create_context_pr(
+        self, owner: str, repo: str, context, user_login: str, default_branch: Optional[str] = None
+    ) -> str:
+        """Create a pull request with context files, looking up the default branch unless given"""
         try:
-            import base64
-            import json
-            from datetime import datetime
-            
-            async with httpx.AsyncClient() as client:
-                # Get the default branch
-                repo_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}',
-                    headers=self.headers
-                )
+            if default_branch is None:
+                status_code, repo_data = await self._get_json(f'https://api.github.com/repos/{owner}/{repo}')
                 
-                if repo_resp.status_code != 200:
-                    raise Exception("Could not access repository")
+                if status_code != 200:
+                    raise GitHubError("Could not access repository")
                 
-                repo_data = repo_resp.json()
                 default_branch = repo_data['default_branch']
-                
-                # Get the latest commit SHA from default branch
-                ref_resp = await client.get(
-                    f'https://api.github.com/repos/{owner}/{repo}/git/ref/heads/{default_branch}',
-                    headers=self.headers
-                )
-                
-                if ref_resp.status_code != 200:
-                    raise Exception("Could not get default branch reference")
-                
-                latest_sha = ref_resp.json()['object']['sha']
-                
-                # Create a new branch for the PR
-                branch_name = f"context-{context.name.lower().replace(' ', '-')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
-                
-                create_ref_resp = await client.post(
-                    f'https://api.github.com/repos/{owner}/{repo}/git/refs',
-                    headers=self.headers,
-                    json={
-                        'ref': f'refs/heads/{branch_name}',
-                        'sha': latest_sha
-                    }
-                )
-                
-                if create_ref_resp.status_code != 201:
-                    raise Exception("Could not create branch")
-                
-                # Create .context directory and files
-                files_to_create = []
-                for file in context.files:
-                    file_path = f".context/{file.name}"
-                    files_to_create.append({
-                        'path': file_path,
-                        'content': file.content
-                    })
-                
-                # Create each file in the .context directory
-                for file_info in files_to_create:
-                    content_encoded = base64.b64encode(file_info['content'].encode('utf-8')).decode('utf-8')
-                    
-                    create_file_resp = await client.put(
-                        f'https://api.github.com/repos/{owner}/{repo}/contents/{file_info["path"]}',
-                        headers=self.headers,
-                        json={
-                            'message': f'Add {file_info["path"]} from context marketplace',
-                            'content': content_encoded,
-                            'branch': branch_name
+            
+            # Get the latest commit and its tree from default branch
+            status_code, branch_data = await self._get_json(f'https://api.github.com/repos/{owner}/{repo}/branches/{default_branch}')
+            
+            if status_code != 200:
+                raise GitHubError("Could not get default branch reference")
+            
+            latest_commit = branch_data['commit']
+            latest_sha = latest_commit['sha']
+            base_tree_sha = latest_commit['commit']['tree']['sha']
+            
+            # Build a tree with every file in the .context directory, with contents inline
+            tree_resp = await gh_request(
+                self.client,
+                'POST',
+                f'https://api.github.com/repos/{owner}/{repo}/git/trees',
+                headers=self.headers,
+                json={
+                    'base_tree': base_tree_sha,
+                    'tree': [
+                        {
+                            'path': f".context/{file.name}",
+                            'mode': '100644',
+                            'type': 'blob',
+                            'content': file.content
                         }
-                    )
-                    
-                    if create_file_resp.status_code not in [201, 200]:
-                        print(f"Warning: Could not create file {file_info['path']}")
-                
-                # Create the pull request
-                pr_title = f"Add project context from {context.name}"
-                pr_body = f"""This PR adds project context files from the Context Marketplace.
+                        for file in context.files
+                    ]
+                }
+            )
+            
+            if tree_resp.status_code != 201:
+                raise GitHubError("Could not create context files")
+            
+            # Add all files in a single commit
+            commit_resp = await gh_request(
+                self.client,
+                'POST',
+                f'https://api.github.com/repos/{owner}/{repo}/git/commits',
+                headers=self.headers,
+                json={
+                    'message': f'Add project context from {context.name}',
+                    'tree': orjson.loads(tree_resp.content)['sha'],
+                    'parents': [latest_sha]
+                }
+            )
+            
+            if commit_resp.status_code != 201:
+                raise GitHubError("Could not commit context files")
+            
+            # Create a new branch for the PR, pointing at the new commit
+            branch_name = f"context-{context.name.lower().replace(' ', '-')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+            
+            create_ref_resp = await gh_request(
+                self.client,
+                'POST',
+                f'https://api.github.com/repos/{owner}/{repo}/git/refs',
+                headers=self.headers,
+                json={
+                    'ref': f'refs/heads/{branch_name}',
+                    'sha': orjson.loads(commit_resp.content)['sha']
+                }
+            )
+            
+            if create_ref_resp.status_code != 201:
+                raise GitHubError("Could not create branch")
+            
+            # Create the pull request
+            pr_title = f"Add project context from {context.name}"
+            pr_body = f"""This PR adds project context files from the Context Marketplace.
 
 **Context:** {context.name}
 {f"**Description:** {context.description}" if context.description else ""}
@@ -232,36 +533,156 @@ The `.context/` directory helps new contributors understand the project quickly
 ---
 *Created by @{user_login} via [Context Marketplace]()*
 """
-                
-                pr_resp = await client.post(
-                    f'https://api.github.com/repos/{owner}/{repo}/pulls',
-                    headers=self.headers,
-                    json={
-                        'title': pr_title,
-                        'body': pr_body,
-                        'head': branch_name,
-                        'base': default_branch
-                    }
-                )
-                
-                if pr_resp.status_code != 201:
-                    error_data = pr_resp.json()
-                    raise Exception(f"Could not create PR: {error_data.get('message', 'Unknown error')}")
-                
-                pr_data = pr_resp.json()
-                return pr_data['html_url']
-                
-        except Exception as e:
-            print(f"Error creating PR: {e}")
-            raise Exception(f"Failed to create pull request: {str(e)}")
+            
+            pr_resp = await gh_request(
+                self.client,
+                'POST',
+                f'https://api.github.com/repos/{owner}/{repo}/pulls',
+                headers=self.headers,
+                json={
+                    'title': pr_title,
+                    'body': pr_body,
+                    'head': branch_name,
+                    'base': default_branch
+                }
+            )
+            
+            if pr_resp.status_code != 201:
+                error_data = orjson.loads(pr_resp.content)
+                raise GitHubError(f"Could not create PR: {error_data.get('message', 'Unknown error')}")
+            
+            pr_data = orjson.loads(pr_resp.content)
+            return pr_data['html_url']
+            
+        except (GitHubError, *GITHUB_ERRORS) as e:
+            logger.warning("Error creating PR on %s/%s: %s", owner, repo, e)
+            raise GitHubError(f"Failed to create pull request: {e}") from e
+
+
+# How often pending context changes are written to the database, in seconds
+FLUSH_INTERVAL = 0.1
+
+CONTEXTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contexts (
+    id TEXT PRIMARY KEY,
+    owner_id INTEGER NOT NULL,
+    metadata BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    context_id TEXT NOT NULL REFERENCES contexts(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (context_id, name)
+);
+"""
+
+# Placeholder sections closing each generated default file
+STACK_SECTIONS = (
+    "## Frameworks & Libraries\n"
+    "_Add frameworks and libraries used in this project_\n\n"
+    "## Tools & Services\n"
+    "_Add development tools, CI/CD, and services used_\n\n"
+    "## Architecture\n"
+    "_Describe the high-level architecture of the project_\n"
+)
+BUSINESS_SECTIONS = (
+    "## Core Features\n"
+    "_List the main features and functionality_\n\n"
+    "## Business Rules\n"
+    "_Document important business rules and constraints_\n\n"
+    "## User Stories\n"
+    "_Add key user stories and use cases_\n"
+)
+PEOPLE_SECTIONS = (
+    "## Team Roles\n"
+    "_Define roles and responsibilities_\n\n"
+    "## Contact Information\n"
+    "_Add relevant contact information_\n"
+)
+GUIDELINES_DEFAULT = (
+    "# Development Guidelines\n\n"
+    "## Code Style\n"
+    "_Define coding standards and style guidelines_\n\n"
+    "## Development Workflow\n"
+    "_Describe the development process and workflow_\n\n"
+    "## Testing Guidelines\n"
+    "_Document testing requirements and practices_\n\n"
+    "## Review Process\n"
+    "_Define the code review process_\n"
+)
+
+
+def website_url(website: str) -> str:
+    """Get a link target for a website given with or without its scheme"""
+    return website if website.startswith(('http://', 'https://')) else f"https://{website}"
+
+
+# Markdown templates for generated files, compiled once at import
+MARKDOWN_ENV = Environment(autoescape=False, keep_trailing_newline=True)
+MARKDOWN_ENV.filters['website_url'] = website_url
+
+PEOPLE_TMPL = MARKDOWN_ENV.from_string(
+    "# People\n\n"
+    "{% if contributors %}## Contributors\n"
+    "{% for contrib in selected %}"
+    "### {{ contrib.name or contrib.login }}\n"
+    "- **GitHub**: [@{{ contrib.login }}](https://github.com/{{ contrib.login }})\n"
+    "{% if contrib.pronouns %}- **Pronouns**: {{ contrib.pronouns }}\n{% endif %}"
+    "{% if contrib.bio %}- **Bio**: {{ contrib.bio }}\n{% endif %}"
+    "{% if contrib.company %}- **Company**: {{ contrib.company }}\n{% endif %}"
+    "{% if contrib.location %}- **Location**: {{ contrib.location }}\n{% endif %}"
+    "{% if contrib.website %}- **Website**: [{{ contrib.website }}]({{ contrib.website|website_url }})\n{% endif %}"
+    "{% if contrib.email %}- **Email**: {{ contrib.email }}\n{% endif %}"
+    "{% if contrib.twitter_username %}"
+    "- **Twitter**: [@{{ contrib.twitter_username }}](https://twitter.com/{{ contrib.twitter_username }})\n"
+    "{% endif %}"
+    "{% if contrib.hireable %}- **Available for hire**: Yes\n{% endif %}"
+    "\n"
+    "{% endfor %}{% endif %}"
+    "{{ sections }}"
+)
+
+# A pending change: (context id, context row or None if deleted, whether to replace every file,
+# file rows to upsert, names of files to delete)
+ContextWrite = Tuple[str, Optional[Tuple[str, int, str]], bool, List[Tuple[str, str, str]], List[str]]
+
+
+def normalize_repo_url(repo_url: str) -> str:
+    """Get a lowercase owner/repo key for a GitHub URL, so URL variants of one repository compare equal"""
+    parsed = GitHubService.parse_repo_url(repo_url)
+    return f"{parsed[0]}/{parsed[1]}".lower() if parsed else repo_url
+
+
+def _trigrams(text: str) -> Set[str]:
+    """Get the set of 3-character substrings of a string"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
 
 
 class ContextService:
-    def __init__(self):
-        # In production, this would use a proper database
+    def __init__(self, db_path: str = "contexts/contexts.db"):
+        # Contexts are served from memory and written back to SQLite in batches
         self.contexts: Dict[str, Context] = {}
-        self.contexts_dir = Path("contexts")
-        self.contexts_dir.mkdir(exist_ok=True)
+        self._dirty: Dict[str, Optional[Set[str]]] = {}  # context id -> changed file names, None for all
+        Path(db_path).parent.mkdir(exist_ok=True)
+        # Writes run in worker threads, one at a time under _db_lock
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db_lock = threading.Lock()
+        self.db.execute("PRAGMA foreign_keys = ON")
+        self.db.executescript(CONTEXTS_SCHEMA)
+        
+        # Lookup indexes, kept in sync by _index_context
+        self._by_owner: Dict[int, Set[str]] = {}  # owner id -> context ids
+        self._by_repo: Dict[Tuple[int, str], str] = {}  # (owner id, normalized repo) -> context id
+        self._repo_keys: Dict[str, Tuple[int, str]] = {}  # context id -> its _by_repo key
+        
+        # Indexes over public contexts
+        self.public_ids: Set[str] = set()
+        self._public_order: List[Tuple[datetime, str]] = []  # (created_at, id) of public contexts, sorted
+        self._search_index: Dict[str, Set[str]] = {}  # lowercase trigram -> context ids
+        self._search_trigrams: Dict[str, Set[str]] = {}  # context id -> its indexed trigrams
+        self._search_fields: Dict[str, Tuple[str, str]] = {}  # context id -> lowercase (name, description)
+        
+        self._load_contexts()
     
     def create_context(self, user_id: int, user_login: str, request: CreateContextRequest) -> Context:
         """Create a new context"""
@@ -283,6 +704,7 @@ class ContextService:
         )
         
         self.contexts[context_id] = context
+        self._index_context(context)
         self._save_context(context)
         
         return context
@@ -292,30 +714,66 @@ class ContextService:
         return self.contexts.get(context_id)
     
     def get_user_contexts(self, user_id: int) -> List[Context]:
-        """Get all contexts for a user"""
-        return [ctx for ctx in self.contexts.values() if ctx.owner_id == user_id]
+        """Get all contexts for a user, oldest first"""
+        return sorted((self.contexts[context_id] for context_id in self._by_owner.get(user_id, ())), key=lambda ctx: ctx.created_at)
     
     def get_public_contexts(self) -> List[Context]:
-        """Get all public contexts"""
-        return [ctx for ctx in self.contexts.values() if ctx.is_public]
+        """Get all public contexts, oldest first"""
+        return [self.contexts[context_id] for _, context_id in self._public_order]
+    
+    def iter_public(self) -> Iterator[Context]:
+        """Lazily iterate over public contexts, oldest first"""
+        return (self.contexts[context_id] for _, context_id in self._public_order)
+    
+    def search_public_contexts(self, query: str, limit: Optional[int] = None) -> List[Context]:
+        """Get public contexts whose name or description contains the query (case-insensitive), oldest first"""
+        query_lower = query.lower()
+        query_trigrams = _trigrams(query_lower)
+        
+        if query_trigrams:
+            # Only contexts containing every trigram of the query can match
+            postings = []
+            for gram in query_trigrams:
+                posting = self._search_index.get(gram)
+                if not posting:
+                    # No public context contains this trigram
+                    return []
+                postings.append(posting)
+            
+            # Intersect from the rarest trigram up, stopping as soon as nothing is left
+            postings.sort(key=len)
+            candidate_ids = set(postings[0])
+            for posting in postings[1:]:
+                candidate_ids &= posting
+                if not candidate_ids:
+                    return []
+            candidates = sorted((self.contexts[context_id] for context_id in candidate_ids), key=lambda ctx: ctx.created_at)
+        else:
+            # Too short to use the index
+            candidates = self.iter_public()
+        
+        matching_contexts = []
+        for context in candidates:
+            name_lower, description_lower = self._search_fields[context.id]
+            if query_lower in name_lower or query_lower in description_lower:
+                matching_contexts.append(context)
+                if limit is not None and len(matching_contexts) >= limit:
+                    break
+        
+        return matching_contexts
     
     def get_context_by_repo_url(self, user_id: int, repo_url: str) -> Optional[Context]:
         """Get context by repository URL for a specific user"""
-        for context in self.contexts.values():
-            if (context.owner_id == user_id and 
-                context.github_repo and 
-                context.github_repo.url == repo_url):
-                return context
-        return None
-    
-    def get_contexts_for_repos(self, user_id: int, repo_urls: List[str]) -> Dict[str, str]:
-        """Get context IDs for a list of repository URLs"""
+        context_id = self._by_repo.get((user_id, normalize_repo_url(repo_url)))
+        return self.contexts[context_id] if context_id else None
+    
+    def get_contexts_for_repos(self, user_id: int, repo_urls: Set[str]) -> Dict[str, str]:
+        """Get context IDs for a set of repository URLs"""
         repo_contexts = {}
-        for context in self.contexts.values():
-            if (context.owner_id == user_id and 
-                context.github_repo and 
-                context.github_repo.url in repo_urls):
-                repo_contexts[context.github_repo.url] = context.id
+        for url in repo_urls:
+            context_id = self._by_repo.get((user_id, normalize_repo_url(url)))
+            if context_id:
+                repo_contexts[url] = context_id
         return repo_contexts
     
     def update_context(self, context_id: str, request: UpdateContextRequest) -> Optional[Context]:
@@ -332,6 +790,7 @@ class ContextService:
             context.is_public = request.is_public
         
         context.updated_at = datetime.now()
+        self._index_context(context)
         self._save_context(context)
         
         return context
@@ -339,6 +798,7 @@ class ContextService:
     def delete_context(self, context_id: str) -> bool:
         """Delete a context"""
         if context_id in self.contexts:
+            self._unindex_context(context_id)
             del self.contexts[context_id]
             self._delete_context_files(context_id)
             return True
@@ -356,32 +816,56 @@ class ContextService:
             content=request.content
         )
         
-        # Remove existing file with same name
-        context.files = [f for f in context.files if f.name != request.name]
-        context.files.append(file_obj)
+        # Replaces any existing file with same name
+        context.put_file(file_obj)
         
         context.updated_at = datetime.now()
-        self._save_context(context)
+        self._save_context_file(context, file_obj.name)
         
         return file_obj
     
+    def _add_files_bulk(self, context_id: str, requests: List[CreateContextFileRequest]) -> List[ContextFile]:
+        """Add several files to a context, replacing any with the same names, as one change"""
+        context = self.contexts.get(context_id)
+        if not context:
+            return []
+        
+        now = datetime.now()
+        file_objs = [
+            ContextFile(
+                name=request.name,
+                file_type=request.file_type,
+                content=request.content,
+                created_at=now,
+                updated_at=now
+            )
+            for request in requests
+        ]
+        
+        for file_obj in file_objs:
+            context.put_file(file_obj)
+            self._save_context_file(context, file_obj.name)
+        context.updated_at = now
+        
+        return file_objs
+    
     def update_context_file(self, context_id: str, file_name: str, request: UpdateContextFileRequest) -> Optional[ContextFile]:
         """Update a file in a context"""
         context = self.contexts.get(context_id)
         if not context:
             return None
         
-        for file_obj in context.files:
-            if file_obj.name == file_name:
-                file_obj.content = request.content
-                file_obj.updated_at = datetime.now()
-                
-                context.updated_at = datetime.now()
-                self._save_context(context)
-                
-                return file_obj
+        file_obj = context.get_file(file_name)
+        if not file_obj:
+            return None
+        
+        file_obj.content = request.content
+        file_obj.updated_at = datetime.now()
         
-        return None
+        context.updated_at = datetime.now()
+        self._save_context_file(context, file_name)
+        
+        return file_obj
     
     def remove_file_from_context(self, context_id: str, file_name: str) -> bool:
         """Remove a file from a context"""
@@ -389,12 +873,9 @@ class ContextService:
         if not context:
             return False
         
-        original_count = len(context.files)
-        context.files = [f for f in context.files if f.name != file_name]
-        
-        if len(context.files) < original_count:
+        if context.drop_file(file_name):
             context.updated_at = datetime.now()
-            self._save_context(context)
+            self._save_context_file(context, file_name)
             return True
         
         return False
@@ -407,6 +888,7 @@ class ContextService:
         
         context.github_repo = github_repo
         context.updated_at = datetime.now()
+        self._index_context(context)
         self._save_context(context)
         
         return context
@@ -423,29 +905,160 @@ class ContextService:
         
         return context
     
-    def _save_context(self, context: Context):
-        """Save context to file (in production, would save to database)"""
-        context_dir = self.contexts_dir / context.id
-        context_dir.mkdir(exist_ok=True)
+    def _index_context(self, context: Context):
+        """Refresh the lookup, visibility and search indexes for a context"""
+        self._unindex_context(context.id)
         
-        # Save context metadata
-        with open(context_dir / "metadata.json", "w") as f:
-            f.write(context.model_dump_json(indent=2))
+        self._by_owner.setdefault(context.owner_id, set()).add(context.id)
+        if context.github_repo:
+            repo_key = (context.owner_id, normalize_repo_url(context.github_repo.url))
+            self._by_repo[repo_key] = context.id
+            self._repo_keys[context.id] = repo_key
         
-        # Save individual files
-        files_dir = context_dir / "files"
-        files_dir.mkdir(exist_ok=True)
+        if not context.is_public:
+            return
         
-        for file_obj in context.files:
-            with open(files_dir / file_obj.name, "w") as f:
-                f.write(file_obj.content)
+        self.public_ids.add(context.id)
+        bisect.insort(self._public_order, (context.created_at, context.id))
+        name_lower = context.name.lower()
+        description_lower = (context.description or "").lower()
+        self._search_fields[context.id] = (name_lower, description_lower)
+        
+        trigrams = _trigrams(name_lower) | _trigrams(description_lower)
+        for gram in trigrams:
+            self._search_index.setdefault(gram, set()).add(context.id)
+        self._search_trigrams[context.id] = trigrams
+    
+    def _unindex_context(self, context_id: str):
+        """Remove a context from the lookup, visibility and search indexes"""
+        context = self.contexts.get(context_id)
+        if context and context.owner_id in self._by_owner:
+            self._by_owner[context.owner_id].discard(context_id)
+        repo_key = self._repo_keys.pop(context_id, None)
+        if repo_key and self._by_repo.get(repo_key) == context_id:
+            del self._by_repo[repo_key]
+        
+        if context_id in self.public_ids:
+            self.public_ids.discard(context_id)
+            del self._public_order[bisect.bisect_left(self._public_order, (context.created_at, context_id))]
+        self._search_fields.pop(context_id, None)
+        for gram in self._search_trigrams.pop(context_id, ()):
+            posting = self._search_index[gram]
+            posting.discard(context_id)
+            if not posting:
+                del self._search_index[gram]
+    
+    def _save_context(self, context: Context):
+        """Mark a context and all its files as changed, to be written by the next flush"""
+        self._dirty[context.id] = None
+    
+    def _save_context_file(self, context: Context, file_name: str):
+        """Mark a context and one of its files as changed, to be written by the next flush"""
+        file_names = self._dirty.setdefault(context.id, set())
+        if file_names is not None:
+            file_names.add(file_name)
     
     def _delete_context_files(self, context_id: str):
-        """Delete context files from disk"""
-        import shutil
-        context_dir = self.contexts_dir / context_id
-        if context_dir.exists():
-            shutil.rmtree(context_dir)
+        """Mark a deleted context, to be removed by the next flush"""
+        self._dirty[context_id] = None
+    
+    def _load_contexts(self):
+        """Load every stored context into memory"""
+        files: Dict[str, List[ContextFile]] = {}
+        for context_id, data in self.db.execute("SELECT context_id, data FROM files ORDER BY rowid"):
+            files.setdefault(context_id, []).append(ContextFile.model_validate_json(data))
+        
+        for context_id, metadata in self.db.execute("SELECT id, metadata FROM contexts"):
+            context = Context.model_validate_json(metadata)
+            for file_obj in files.get(context_id, ()):
+                context.put_file(file_obj)
+            self.contexts[context_id] = context
+            self._index_context(context)
+    
+    def _serialize_changes(self, dirty: Dict[str, Optional[Set[str]]]) -> List[ContextWrite]:
+        """Serialize the given pending context changes"""
+        writes = []
+        for context_id, file_names in dirty.items():
+            context = self.contexts.get(context_id)
+            if context is None:
+                writes.append((context_id, None, True, [], []))
+                continue
+            
+            context_row = (context.id, context.owner_id, context.model_dump_json(exclude={'files'}))
+            if file_names is None:
+                changed_files, removed_names = context.files, []
+            else:
+                changed_files = [context.files_by_name[name] for name in file_names if name in context.files_by_name]
+                removed_names = [name for name in file_names if name not in context.files_by_name]
+            file_rows = [(context.id, file_obj.name, file_obj.model_dump_json()) for file_obj in changed_files]
+            writes.append((context_id, context_row, file_names is None, file_rows, removed_names))
+        return writes
+    
+    def _write_changes(self, writes: List[ContextWrite]):
+        """Apply serialized context changes to the database in one transaction"""
+        with self._db_lock, self.db:
+            for context_id, context_row, replace_files, file_rows, removed_names in writes:
+                if context_row is None:
+                    # Its files are dropped by the cascade
+                    self.db.execute("DELETE FROM contexts WHERE id = ?", (context_id,))
+                    continue
+                
+                self.db.execute(
+                    "INSERT INTO contexts (id, owner_id, metadata) VALUES (?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET metadata = excluded.metadata",
+                    context_row
+                )
+                if replace_files:
+                    self.db.execute("DELETE FROM files WHERE context_id = ?", (context_id,))
+                self.db.executemany(
+                    "DELETE FROM files WHERE context_id = ? AND name = ?",
+                    [(context_id, name) for name in removed_names]
+                )
+                self.db.executemany(
+                    "INSERT INTO files (context_id, name, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT (context_id, name) DO UPDATE SET data = excluded.data",
+                    file_rows
+                )
+    
+    def _restore_dirty(self, dirty: Dict[str, Optional[Set[str]]]):
+        """Put changes from a failed flush back, merged with any made since"""
+        for context_id, file_names in dirty.items():
+            if context_id not in self._dirty:
+                self._dirty[context_id] = file_names
+            elif file_names is None or self._dirty[context_id] is None:
+                self._dirty[context_id] = None
+            else:
+                self._dirty[context_id] |= file_names
+    
+    async def flush(self):
+        """Write every pending context change to the database, keeping them pending on failure"""
+        dirty, self._dirty = self._dirty, {}
+        if not dirty:
+            return
+        
+        try:
+            # Serialize on the event loop, where contexts are mutated, and write from a thread
+            writes = self._serialize_changes(dirty)
+            await asyncio.to_thread(self._write_changes, writes)
+        except Exception:
+            self._restore_dirty(dirty)
+            raise
+    
+    async def _flush_logged(self):
+        """Flush pending changes, logging failures so they are retried by the next flush"""
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Could not write context changes, will retry")
+    
+    async def run_flusher(self):
+        """Flush pending changes every FLUSH_INTERVAL seconds, and once more when cancelled"""
+        try:
+            while True:
+                await asyncio.sleep(FLUSH_INTERVAL)
+                await self._flush_logged()
+        finally:
+            await self._flush_logged()
     
     def generate_default_files(self, context_id: str, github_service: Optional[GitHubService] = None) -> Optional[Context]:
         """Generate default context files"""
@@ -453,134 +1066,68 @@ class ContextService:
         if not context:
             return None
         
-        # Generate stack.md
-        stack_content = self._generate_stack_content(context, github_service)
-        self.add_file_to_context(context_id, CreateContextFileRequest(
-            name="stack.md",
-            file_type=ContextFileType.STACK,
-            content=stack_content
-        ))
-        
-        # Generate business.md
-        business_content = self._generate_business_content(context)
-        self.add_file_to_context(context_id, CreateContextFileRequest(
-            name="business.md",
-            file_type=ContextFileType.BUSINESS,
-            content=business_content
-        ))
-        
-        # Generate people.md
-        people_content = self._generate_people_content(context)
-        self.add_file_to_context(context_id, CreateContextFileRequest(
-            name="people.md",
-            file_type=ContextFileType.PEOPLE,
-            content=people_content
-        ))
-        
-        # Generate guidelines.md
-        guidelines_content = self._generate_guidelines_content(context, github_service)
-        self.add_file_to_context(context_id, CreateContextFileRequest(
-            name="guidelines.md",
-            file_type=ContextFileType.GUIDELINES,
-            content=guidelines_content
-        ))
+        self._add_files_bulk(context_id, [
+            CreateContextFileRequest(
+                name="stack.md",
+                file_type=ContextFileType.STACK,
+                content=self._generate_stack_content(context, github_service)
+            ),
+            CreateContextFileRequest(
+                name="business.md",
+                file_type=ContextFileType.BUSINESS,
+                content=self._generate_business_content(context)
+            ),
+            CreateContextFileRequest(
+                name="people.md",
+                file_type=ContextFileType.PEOPLE,
+                content=self._generate_people_content(context)
+            ),
+            CreateContextFileRequest(
+                name="guidelines.md",
+                file_type=ContextFileType.GUIDELINES,
+                content=self._generate_guidelines_content(context, github_service)
+            ),
+        ])
         
-        return self.contexts.get(context_id)
+        return context
     
     def _generate_stack_content(self, context: Context, github_service: Optional[GitHubService]) -> str:
         """Generate stack.md content"""
-        content = "# Technology Stack\n\n"
+        parts = ["# Technology Stack\n\n"]
         
         if context.github_repo and context.github_repo.languages:
-            content += "## Languages\n"
-            for lang in sorted(context.github_repo.languages.keys()):
-                content += f"- **{lang}**\n"
-            content += "\n"
+            parts.append("## Languages\n")
+            parts.extend(f"- **{lang}**\n" for lang in sorted(context.github_repo.languages))
+            parts.append("\n")
         
-        content += "## Frameworks & Libraries\n"
-        content += "_Add frameworks and libraries used in this project_\n\n"
-        
-        content += "## Tools & Services\n"
-        content += "_Add development tools, CI/CD, and services used_\n\n"
-        
-        content += "## Architecture\n"
-        content += "_Describe the high-level architecture of the project_\n"
-        
-        return content
+        parts.append(STACK_SECTIONS)
+        return "".join(parts)
     
     def _generate_business_content(self, context: Context) -> str:
         """Generate business.md content"""
-        content = "# Business Logic\n\n"
+        parts = ["# Business Logic\n\n"]
         
         if context.github_repo and context.github_repo.description:
-            content += f"## Project Description\n{context.github_repo.description}\n\n"
-        
-        content += "## Core Features\n"
-        content += "_List the main features and functionality_\n\n"
+            parts.append(f"## Project Description\n{context.github_repo.description}\n\n")
         
-        content += "## Business Rules\n"
-        content += "_Document important business rules and constraints_\n\n"
-        
-        content += "## User Stories\n"
-        content += "_Add key user stories and use cases_\n"
-        
-        return content
+        parts.append(BUSINESS_SECTIONS)
+        return "".join(parts)
     
     def _generate_people_content(self, context: Context) -> str:
         """Generate people.md content"""
-        content = "# People\n\n"
-        
-        if context.contributors:
-            content += "## Contributors\n"
-            for contrib in context.contributors:
-                if contrib.selected:
-                    content += f"### {contrib.name or contrib.login}\n"
-                    content += f"- **GitHub**: [@{contrib.login}](https://github.com/{contrib.login})\n"
-                    
-                    if contrib.pronouns:
-                        content += f"- **Pronouns**: {contrib.pronouns}\n"
-                    
-                    if contrib.bio:
-                        content += f"- **Bio**: {contrib.bio}\n"
-                    
-                    if contrib.company:
-                        content += f"- **Company**: {contrib.company}\n"
-                    
-                    if contrib.location:
-                        content += f"- **Location**: {contrib.location}\n"
-                    
-                    if contrib.website:
-                        # Clean up the website URL
-                        website = contrib.website
-                        if not website.startswith(('http://', 'https://')):
-                            website = f"https://{website}"
-                        content += f"- **Website**: [{contrib.website}]({website})\n"
-                    
-                    if contrib.email:
-                        content += f"- **Email**: {contrib.email}\n"
-                    
-                    if contrib.twitter_username:
-                        content += f"- **Twitter**: [@{contrib.twitter_username}](https://twitter.com/{contrib.twitter_username})\n"
-                    
-                    
-                    if contrib.hireable:
-                        content += f"- **Available for hire**: Yes\n"
-                    
-                    
-                    content += "\n"
-        
-        content += "## Team Roles\n"
-        content += "_Define roles and responsibilities_\n\n"
-        
-        content += "## Contact Information\n"
-        content += "_Add relevant contact information_\n"
-        
-        return content
+        selected = [contrib for contrib in context.contributors if contrib.selected]
+        if not selected:
+            # Nothing per contributor to render
+            return "".join(("# People\n\n", "## Contributors\n" if context.contributors else "", PEOPLE_SECTIONS))
+        
+        return PEOPLE_TMPL.render(
+            contributors=context.contributors,
+            selected=selected,
+            sections=PEOPLE_SECTIONS
+        )
     
     def _generate_guidelines_content(self, context: Context, github_service: Optional[GitHubService]) -> str:
         """Generate guidelines.md content"""
-        content = "# Development Guidelines\n\n"
-        
         # Try to get CONTRIBUTING.md from the repository
         contributing_content = None
         if context.github_repo and github_service:
@@ -591,22 +1138,8 @@ class ContextService:
                 pass
         
         if contributing_content:
-            content += "## Contributing Guidelines\n"
-            content += contributing_content + "\n\n"
-        else:
-            content += "## Code Style\n"
-            content += "_Define coding standards and style guidelines_\n\n"
-            
-            content += "## Development Workflow\n"
-            content += "_Describe the development process and workflow_\n\n"
-            
-            content += "## Testing Guidelines\n"
-            content += "_Document testing requirements and practices_\n\n"
-            
-            content += "## Review Process\n"
-            content += "_Define the code review process_\n"
-        
-        return content
+            return f"# Development Guidelines\n\n## Contributing Guidelines\n{contributing_content}\n\n"
+        return GUIDELINES_DEFAULT
 
 
 # Global service instances (in production, would use dependency injection)
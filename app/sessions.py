@@ -0,0 +1,108 @@
+import secrets
+from typing import Optional
+
+import itsdangerous
+import orjson
+from itsdangerous.exc import BadSignature
+from redis.asyncio import Redis
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RedisSessionMiddleware:
+    """Session middleware keeping session data in Redis.
+
+    Only a signed random session id travels in the cookie, so any worker
+    can serve any request and the access token never leaves the server.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        redis: Redis,
+        secret_key: str,
+        session_cookie: str = "session",
+        max_age: int = 14 * 24 * 60 * 60,  # 14 days, in seconds
+        key_prefix: str = "session:",
+        https_only: bool = False
+    ):
+        self.app = app
+        self.redis = redis
+        self.signer = itsdangerous.TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.key_prefix = key_prefix
+        self.security_flags = "httponly; samesite=lax"
+        if https_only:
+            self.security_flags += "; secure"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        connection = HTTPConnection(scope)
+        session_id = self._load_session_id(connection)
+        initial_data: Optional[bytes] = None
+
+        if session_id:
+            initial_data = await self.redis.get(self.key_prefix + session_id)
+            if initial_data is None:
+                # Expired or unknown session, start a fresh one
+                session_id = None
+
+        scope["session"] = orjson.loads(initial_data) if initial_data else {}
+        was_authenticated = "user" in scope["session"]
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal session_id
+
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+
+                if session:
+                    data = orjson.dumps(session)
+                    if data != initial_data:
+                        # We have new or changed session data to persist
+                        old_session_id = session_id
+                        if session_id is None or ("user" in session and not was_authenticated):
+                            # New session, or one just logged in: a fresh id prevents session fixation
+                            session_id = secrets.token_urlsafe(32)
+                        await self.redis.set(self.key_prefix + session_id, data, ex=self.max_age)
+                        if old_session_id is not None and old_session_id != session_id:
+                            await self.redis.delete(self.key_prefix + old_session_id)
+                    else:
+                        # Unchanged session, only push its expiry back
+                        await self.redis.expire(self.key_prefix + session_id, self.max_age)
+                    # Re-signed on every response so active sessions slide, as with Starlette's SessionMiddleware
+                    headers.append("Set-Cookie", self._cookie(self.signer.sign(session_id).decode("utf-8")))
+                elif initial_data:
+                    # The session has been cleared
+                    await self.redis.delete(self.key_prefix + session_id)
+                    headers.append(
+                        "Set-Cookie",
+                        self._cookie("null", "expires=Thu, 01 Jan 1970 00:00:00 GMT; ")
+                    )
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _load_session_id(self, connection: HTTPConnection) -> Optional[str]:
+        """Get the session id from the signed cookie, if valid"""
+        cookie = connection.cookies.get(self.session_cookie)
+        if not cookie:
+            return None
+
+        try:
+            return self.signer.unsign(cookie.encode("utf-8"), max_age=self.max_age).decode("utf-8")
+        except BadSignature:
+            return None
+
+    def _cookie(self, value: str, expiry: Optional[str] = None) -> str:
+        """Build the Set-Cookie header value"""
+        if expiry is None:
+            expiry = f"Max-Age={self.max_age}; "
+        return f"{self.session_cookie}={value}; path=/; {expiry}{self.security_flags}"